@@ -0,0 +1,229 @@
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+from typing import Callable, Dict, List, Tuple
+from nurbs import backend, parallel
+from nurbs.curve import NURBSCurve
+from nurbs.surface import NURBSSurface
+from nurbs.synthetic import SyntheticCurveGenerator
+from interpolation.fitter import NURBSFitter
+from interpolation.surface_fitter import NURBSSurfaceFitter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# A benchmark factory builds its inputs and returns (workload, points processed per call)
+Workload = Tuple[Callable[[], object], int]
+
+
+def clamped_knots(n: int, degree: int) -> np.ndarray:
+    internal = np.linspace(0, 1, n - degree + 1)[1:-1]
+    return np.concatenate([np.zeros(degree + 1), internal, np.ones(degree + 1)])
+
+
+def random_curve(n: int, degree: int, dim: int, rng: np.random.Generator) -> NURBSCurve:
+    return NURBSCurve(rng.random((n, dim)), rng.random(n) + 0.5, clamped_knots(n, degree), degree)
+
+
+def curve_evaluate(n: int, degree: int, samples: int, dim: int) -> Workload:
+    curve = random_curve(n, degree, dim, np.random.default_rng(0))
+    ts = np.linspace(0, 1, samples)
+    return (lambda: [curve.evaluate(t) for t in ts]), samples
+
+
+def curve_evaluate_many(n: int, degree: int, samples: int, dim: int) -> Workload:
+    curve = random_curve(n, degree, dim, np.random.default_rng(0))
+    ts = np.linspace(0, 1, samples)
+    return (lambda: curve.evaluate_many(ts)), samples
+
+
+def curve_evaluate_bezier(n: int, degree: int, samples: int, dim: int) -> Workload:
+    curve = random_curve(n, degree, dim, np.random.default_rng(0))
+    ts = np.linspace(0, 1, samples)
+    return (lambda: curve.evaluate_bezier(ts)), samples
+
+
+def parallel_evaluate_curve(workers: int, samples: int) -> Workload:
+    curve = random_curve(10, 3, 3, np.random.default_rng(0))
+    ts = np.linspace(0, 1, samples)
+    out = np.empty((samples, 3))
+    return (lambda: parallel.evaluate_curve(curve, ts, out, workers)), samples
+
+
+def surface_evaluate(n: int, degree: int, samples: int, dim: int) -> Workload:
+    rng = np.random.default_rng(0)
+    knots = clamped_knots(n, degree)
+    surface = NURBSSurface(rng.random((n, n, dim)), rng.random((n, n)) + 0.5,
+                           knots, knots, degree, degree)
+    uv = rng.random((samples, 2))
+    return (lambda: [surface.evaluate(u, v) for u, v in uv]), samples
+
+
+def surface_evaluate_grid(n: int, degree: int, samples: int, dim: int) -> Workload:
+    rng = np.random.default_rng(0)
+    knots = clamped_knots(n, degree)
+    surface = NURBSSurface(rng.random((n, n, dim)), rng.random((n, n)) + 0.5,
+                           knots, knots, degree, degree)
+    side = np.linspace(0, 1, int(np.sqrt(samples)))
+    return (lambda: surface.evaluate_grid(side, side)), len(side) ** 2
+
+
+def fitter_interpolate(degree: int, samples: int, dim: int) -> Workload:
+    points = np.cumsum(np.random.default_rng(0).random((samples, dim)), axis=0)
+    return (lambda: NURBSFitter.interpolate(points, degree)), samples
+
+
+def fitter_approximate(control_points: int, samples: int, dim: int) -> Workload:
+    points = np.cumsum(np.random.default_rng(0).random((samples, dim)), axis=0)
+    return (lambda: NURBSFitter.approximate(points, control_points)), samples
+
+
+def surface_fit_scattered(control_points: int, samples: int) -> Workload:
+    uv = np.random.default_rng(0).random((samples, 2))
+    points = np.column_stack([uv, np.sin(3 * uv[:, 0]) * np.cos(2 * uv[:, 1])])
+    return (lambda: NURBSSurfaceFitter.fit_scattered(
+        points, uv, (control_points, control_points))), samples
+
+
+def synthetic_generate(curves: int, samples: int) -> Workload:
+    generator = SyntheticCurveGenerator(
+        {"points_per_curve": samples, "noise_level": 0.1, "z_clip": [0, 3]}, seed=0)
+    return (lambda: generator.generate_batch("random", curves)), curves * samples
+
+
+def startup_import(module: str) -> Workload:
+    # Cold `import module` in a fresh interpreter, interpreter start included -> imports/s
+    command = [sys.executable, "-c", f"import {module}"]
+    return (lambda: subprocess.run(command, cwd=ROOT, check=True)), 1
+
+
+# name -> (factory, parameter grid), quick grid first then the full one
+BENCHMARKS: Dict[str, Tuple[Callable[..., Workload], Dict[str, list], Dict[str, list]]] = {
+    "curve.evaluate": (curve_evaluate,
+                       dict(n=[10], degree=[3], samples=[1000], dim=[3]),
+                       dict(n=[10, 100], degree=[2, 3, 5], samples=[1000], dim=[2, 3])),
+    "curve.evaluate_many": (curve_evaluate_many,
+                            dict(n=[10], degree=[3], samples=[100_000], dim=[3]),
+                            dict(n=[10, 100, 1000], degree=[2, 3, 5],
+                                 samples=[1000, 100_000, 1_000_000], dim=[2, 3])),
+    "curve.evaluate_bezier": (curve_evaluate_bezier,
+                              dict(n=[10], degree=[3], samples=[100_000], dim=[3]),
+                              dict(n=[10, 100, 1000], degree=[2, 3, 5],
+                                   samples=[1000, 100_000, 1_000_000], dim=[2, 3])),
+    "parallel.evaluate_curve": (parallel_evaluate_curve,
+                                dict(workers=[1, 4], samples=[1_000_000]),
+                                dict(workers=[1, 2, 4, 8, 16, 32], samples=[1_000_000, 10_000_000])),
+    "surface.evaluate": (surface_evaluate,
+                         dict(n=[6], degree=[3], samples=[500], dim=[3]),
+                         dict(n=[6, 20], degree=[1, 3], samples=[1000], dim=[3])),
+    "surface.evaluate_grid": (surface_evaluate_grid,
+                              dict(n=[6], degree=[3], samples=[250_000], dim=[3]),
+                              dict(n=[6, 20, 100], degree=[1, 3],
+                                   samples=[10_000, 1_000_000], dim=[3])),
+    "fitter.interpolate": (fitter_interpolate,
+                           dict(degree=[3], samples=[1000], dim=[3]),
+                           dict(degree=[2, 3, 5], samples=[100, 1000, 50_000], dim=[2, 3])),
+    "fitter.approximate": (fitter_approximate,
+                           dict(control_points=[20], samples=[100_000], dim=[3]),
+                           dict(control_points=[20, 200], samples=[10_000, 100_000], dim=[2, 3])),
+    "surface_fitter.fit_scattered": (surface_fit_scattered,
+                                     dict(control_points=[20], samples=[100_000]),
+                                     dict(control_points=[10, 20, 40], samples=[100_000, 1_000_000])),
+    "synthetic.generate": (synthetic_generate,
+                           dict(curves=[256], samples=[100]),
+                           dict(curves=[1, 256, 4096], samples=[100, 1000])),
+    "startup.import": (startup_import,
+                       dict(module=["main"]),
+                       dict(module=["main", "nurbs.curve", "interpolation.fitter"])),
+}
+
+
+def measure(factory: Callable[..., Workload], params: dict, repeat: int) -> dict:
+    workload, points = factory(**params)
+    workload()  # warm-up, fills caches the way a training loop would
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        workload()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    workload()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    best = min(timings)
+    return {"seconds": best, "points_per_sec": points / best, "peak_bytes": peak}
+
+
+def run(names: List[str], quick: bool, repeat: int) -> List[dict]:
+    results = []
+    for name in names:
+        factory, quick_grid, full_grid = BENCHMARKS[name]
+        grid = quick_grid if quick else full_grid
+        for values in itertools.product(*grid.values()):
+            params = dict(zip(grid.keys(), values))
+            result = {"name": name, "params": params, "backend": backend.get_backend(),
+                      **measure(factory, params, repeat)}
+            results.append(result)
+            print(f"{name:24s} {result['backend']:6s} {json.dumps(params):64s} "
+                  f"{result['points_per_sec']:14.0f} pts/s {result['peak_bytes'] / 2**20:9.2f} MiB")
+    return results
+
+
+def compare(results: List[dict], baseline: List[dict], threshold: float) -> List[str]:
+    # Cases whose throughput fell more than threshold (fraction) below the baseline run on
+    # the same backend; baselines saved without a backend match nothing
+    key = lambda result: (result["name"], json.dumps(result["params"], sort_keys=True),
+                          result.get("backend"))
+    reference = {key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        old = reference.get(key(result))
+        if old is None:
+            continue
+        ratio = result["points_per_sec"] / old["points_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append(f"{result['name']} [{result['backend']}] {json.dumps(result['params'])}: "
+                               f"{ratio:.2f}x baseline throughput")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NURBS hot path benchmarks")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help="Benchmarks to run")
+    parser.add_argument('--quick', action='store_true',
+                        help="Run a single representative size per benchmark")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Timed runs per case, the best one is kept")
+    parser.add_argument('--output', type=str, help="Write results to this JSON file")
+    parser.add_argument('--baseline', type=str, help="Compare against a saved JSON run")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="Allowed throughput loss against the baseline (fraction)")
+    parser.add_argument('--backend', choices=backend.available_backends(), default=backend.get_backend(),
+                        help="Kernel backend for span search and point evaluation")
+    args = parser.parse_args()
+
+    backend.set_backend(args.backend)
+    results = run(args.only, args.quick, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import io
+import json
+import os
+import zipfile
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from nurbs.batch import NURBSCurveBatch
+from nurbs.synthetic import SyntheticCurveGenerator
+from interpolation.fitter import NURBSFitter
+from dataset.storage import NURBSDatasetWriter
+
+
+@dataclass
+class ShardSpec:
+    index: int
+    start: int  # first global curve index
+    stop: int
+    seed: np.random.SeedSequence
+
+
+class DatasetBuilder:
+    '''
+        Generates synthetic curves and fits them, one shard per task.
+        Shards are cut by global curve index and each gets its own
+        SeedSequence child, so the output only depends on the seed and the
+        shard size, never on the number of workers.
+    '''
+
+    def __init__(self, config: dict):
+        self.synthetic = config["synthetic"]
+        self.options = config.get("dataset", {})
+
+    def shards(self) -> List[ShardSpec]:
+        total = self.synthetic["num_samples"]
+        shard_size = self.options.get("shard_size", 1000)
+        starts = range(0, total, shard_size)
+        seeds = np.random.SeedSequence(self.options.get("seed", 0)).spawn(len(starts))
+        return [
+            ShardSpec(index, start, min(start + shard_size, total), seed)
+            for index, (start, seed) in enumerate(zip(starts, seeds))
+        ]
+
+    def build(self, output_dir: str, workers: Optional[int] = None) -> List[str]:
+        os.makedirs(output_dir, exist_ok=True)
+        shards = self.shards()
+
+        if workers == 1:
+            paths = [self.build_shard(shard, output_dir) for shard in shards]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                paths = list(pool.map(self.build_shard, shards,
+                                      [output_dir] * len(shards)))
+
+        manifest = {
+            "seed": self.options.get("seed", 0),
+            "num_curves": self.synthetic["num_samples"],
+            "curve_types": list(self.synthetic["curve_types"]),
+            "shards": [os.path.basename(path) for path in paths],
+        }
+        with open(os.path.join(output_dir, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+        return paths
+
+    def export(self, path: str) -> int:
+        '''
+            Single-process build into one memory-mapped NURBS dataset file
+            (dataset.storage) instead of .npz shards, for headless batch
+            jobs. Same shards and seeds as build(), so the same curves.
+            Returns the number of curves written.
+        '''
+
+        with NURBSDatasetWriter(path) as writer:
+            for shard in self.shards():
+                arrays = self.generate_shard(shard)
+                writer.append_batch(NURBSCurveBatch(
+                    arrays["control_points"], arrays["weights"], arrays["knots"], int(arrays["degree"])))
+        return self.synthetic["num_samples"]
+
+    def build_shard(self, shard: ShardSpec, output_dir: str) -> str:
+        arrays = self.generate_shard(shard)
+        path = os.path.join(output_dir, f"shard-{shard.index:05d}.npz")
+        DatasetBuilder.write_npz(path, arrays)
+        return path
+
+    def generate_shard(self, shard: ShardSpec) -> Dict[str, np.ndarray]:
+        curve_types = self.synthetic["curve_types"]
+        generator = SyntheticCurveGenerator(self.synthetic, seed=shard.seed)
+
+        labels = np.arange(shard.start, shard.stop) % len(curve_types)
+        points = np.empty((len(labels), self.synthetic.get("points_per_curve", 100), 3))
+        for label, curve_type in enumerate(curve_types):
+            members = labels == label
+            points[members] = generator.generate_batch(curve_type, np.count_nonzero(members))
+
+        fitted = NURBSFitter.interpolate_batch(
+            points, degree=self.options.get("degree", 3),
+            parameterization=self.options.get("parameterization", "chord"))
+        return {
+            "points": points,
+            "labels": labels,
+            "control_points": fitted.control_points,
+            "weights": fitted.weights,
+            "knots": fitted.knots,
+            "degree": np.array(fitted.degree),
+        }
+
+    @staticmethod
+    def write_npz(path: str, arrays: Dict[str, np.ndarray]) -> None:
+        # np.savez stamps the current time into the archive, pin it for byte-identical shards
+        with zipfile.ZipFile(path, "w") as archive:
+            for name, array in arrays.items():
+                buffer = io.BytesIO()
+                np.lib.format.write_array(buffer, np.asarray(array), allow_pickle=False)
+                archive.writestr(zipfile.ZipInfo(f"{name}.npy", (1980, 1, 1, 0, 0, 0)),
+                                 buffer.getvalue())
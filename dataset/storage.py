@@ -0,0 +1,186 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+from typing import Iterable, Literal, Optional, Union
+from nurbs.curve import NURBSCurve
+from nurbs.surface import NURBSSurface
+from nurbs.batch import NURBSCurveBatch
+
+# Binary layout (little-endian, float64 data):
+#     header   HEADER_SIZE bytes (HEADER_DTYPE, zero padded)
+#     index    count x INDEX_DTYPE records
+#     points   (num_points, dim) control points of every entry, back to back
+#     weights  (num_points,)
+#     knots    (num_knots,) knot vectors (u then v for surfaces)
+# A curve uses the first slot of the 2-element index fields, a surface both
+# (u, v). Entry k is read from its index record alone, so random access is
+# O(1) and never parses the rest of the file.
+
+MAGIC = b"NURBSDS1"
+VERSION = 1
+HEADER_SIZE = 64
+KINDS = {"curve": 0, "surface": 1}
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"), ("version", "<u4"), ("kind", "<u4"), ("dim", "<u8"),
+    ("count", "<u8"), ("num_points", "<u8"), ("num_knots", "<u8"),
+])
+INDEX_DTYPE = np.dtype([
+    ("point_offset", "<i8"), ("shape", "<i8", (2,)),
+    ("knot_offset", "<i8", (2,)), ("knot_count", "<i8", (2,)), ("degree", "<i8", (2,)),
+])
+
+Kind = Literal["curve", "surface"]
+Entry = Union[NURBSCurve, NURBSSurface]
+
+
+class NURBSDatasetWriter:
+    '''
+        Streams entries to disk: sections are spooled to temporary files
+        next to the output and concatenated behind the header on close().
+    '''
+
+    def __init__(self, path: str, kind: Kind = "curve"):
+        self.path = path
+        self.kind = kind
+        self.dim: Optional[int] = None
+        self._index = []
+        self._num_points = 0
+        self._num_knots = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        self._sections = [tempfile.TemporaryFile(dir=directory) for _ in range(3)]
+
+    def __enter__(self) -> "NURBSDatasetWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def append(self, nurbs: Entry) -> None:
+        points, weights = nurbs.control_points, nurbs.weights
+        if self.kind == "curve":
+            knots = [nurbs.knots]
+            degrees = [nurbs.degree, 0]
+            shape = [len(weights), 1]
+        else:
+            knots = [nurbs.knots_u, nurbs.knots_v]
+            degrees = [nurbs.degree_u, nurbs.degree_v]
+            shape = list(weights.shape)
+
+        dim = points.shape[-1]
+        if self.dim is None:
+            self.dim = dim
+        elif dim != self.dim:
+            raise ValueError(f"Entry dimension {dim} differs from dataset dimension {self.dim}")
+
+        counts = [len(k) for k in knots] + [0] * (2 - len(knots))
+        self._index.append((self._num_points, shape,
+                            [self._num_knots, self._num_knots + counts[0]],
+                            counts, degrees))
+        self._write(points.reshape(-1, dim), weights.ravel(), np.concatenate(knots))
+        self._num_points += weights.size
+        self._num_knots += sum(counts)
+
+    def append_batch(self, batch: NURBSCurveBatch) -> None:
+        for i in range(len(batch)):
+            self.append(batch[i])
+
+    def _write(self, points: np.ndarray, weights: np.ndarray, knots: np.ndarray) -> None:
+        for section, data in zip(self._sections, (points, weights, knots)):
+            section.write(np.ascontiguousarray(data, dtype="<f8").tobytes())
+
+    def close(self) -> None:
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header[0] = (MAGIC, VERSION, KINDS[self.kind], self.dim or 0,
+                     len(self._index), self._num_points, self._num_knots)
+        index = np.array(self._index, dtype=INDEX_DTYPE)
+
+        with open(self.path, "wb") as f:
+            f.write(header.tobytes().ljust(HEADER_SIZE, b"\0"))
+            f.write(index.tobytes())
+            for section in self._sections:
+                section.seek(0)
+                shutil.copyfileobj(section, f)
+                section.close()
+
+
+class NURBSDataset:
+    '''
+        Read-only memory-mapped dataset, entries are zero-copy views.
+    '''
+
+    def __init__(self, path: str):
+        self._data = np.memmap(path, dtype=np.uint8, mode="r")
+        header = self._data[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)[0]
+        if header["magic"] != MAGIC:
+            raise ValueError(f"Not a NURBS dataset: {path}")
+        if header["version"] != VERSION:
+            raise ValueError(f"Unsupported dataset version {header['version']}")
+
+        self.kind: Kind = "curve" if header["kind"] == KINDS["curve"] else "surface"
+        self.dim = int(header["dim"])
+        count, num_points = int(header["count"]), int(header["num_points"])
+
+        offset = HEADER_SIZE
+        self.index = self._section(offset, INDEX_DTYPE, count)
+        offset += count * INDEX_DTYPE.itemsize
+        self.points = self._section(offset, "<f8", num_points * self.dim).reshape(num_points, self.dim)
+        offset += num_points * self.dim * 8
+        self.weights = self._section(offset, "<f8", num_points)
+        offset += num_points * 8
+        self.knots = self._section(offset, "<f8", int(header["num_knots"]))
+
+    def _section(self, offset: int, dtype, count: int) -> np.ndarray:
+        return self._data[offset:offset + count * np.dtype(dtype).itemsize].view(dtype)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, k: int) -> Entry:
+        record = self.index[k]
+        start = record["point_offset"]
+        rows, cols = record["shape"]
+        points = self.points[start:start + rows * cols]
+        weights = self.weights[start:start + rows * cols]
+        knots = [self.knots[offset:offset + count]
+                 for offset, count in zip(record["knot_offset"], record["knot_count"])]
+
+        if self.kind == "curve":
+            return NURBSCurve(
+                control_points=points,
+                weights=weights,
+                knots=knots[0],
+                degree=int(record["degree"][0])
+            )
+        return NURBSSurface(
+            control_points=points.reshape(rows, cols, self.dim),
+            weights=weights.reshape(rows, cols),
+            knots_u=knots[0],
+            knots_v=knots[1],
+            degree_u=int(record["degree"][0]),
+            degree_v=int(record["degree"][1])
+        )
+
+    def curve_batch(self, start: int, stop: int) -> NURBSCurveBatch:
+        # Zero-copy batch over consecutive curves sharing size and degree
+        records = self.index[start:stop]
+        n, m = records["shape"][0, 0], records["knot_count"][0, 0]
+        if (self.kind != "curve" or np.any(records["shape"][:, 0] != n)
+                or np.any(records["degree"][:, 0] != records["degree"][0, 0])):
+            raise ValueError("Batch entries must be curves of identical size and degree")
+
+        first, last = records["point_offset"][0], records["point_offset"][-1] + n
+        first_knot = records["knot_offset"][0, 0]
+        return NURBSCurveBatch(
+            control_points=self.points[first:last].reshape(len(records), n, self.dim),
+            weights=self.weights[first:last].reshape(len(records), n),
+            knots=self.knots[first_knot:first_knot + len(records) * m].reshape(len(records), m),
+            degree=int(records["degree"][0, 0])
+        )
+
+
+def write_dataset(path: str, entries: Iterable[Entry], kind: Kind = "curve") -> None:
+    with NURBSDatasetWriter(path, kind) as writer:
+        for entry in entries:
+            writer.append(entry)
@@ -29,17 +29,8 @@ def run():
     fig = plt.figure(figsize=(12, 6))
     ax = fig.add_subplot(111, projection='3d')
     
-    # Generate evaluation grid
-    u = np.linspace(0, 1, 20)
-    v = np.linspace(0, 1, 20)
-    U, V = np.meshgrid(u, v)
-    
-    # Evaluate surface points
-    points = np.array([[surface.evaluate(ui, vi) for vi in v] for ui in u])
-    
-    # Plot surface
-    ax.plot_surface(points[:,:,0], points[:,:,1], points[:,:,2], 
-                   alpha=0.8, cmap='viridis')
+    # Adaptive triangle mesh: flat regions get few triangles
+    NURBSPresenter.render_surface(surface, ax)
     
     # Plot control points
     ctrl = surface.control_points
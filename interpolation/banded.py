@@ -0,0 +1,119 @@
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+from typing import Optional, Tuple
+from nurbs.basis import batch_find_spans, find_spans, basis_functions, span_indices
+
+
+def collocation_bands(params: np.ndarray, knots: np.ndarray,
+                      degree: int) -> Tuple[np.ndarray, int, int]:
+    '''
+        Collocation matrix A[i, j] = N_j(params[i]) in LAPACK band storage:
+            ab[u + i - j, j] = A[i, j]
+        Returns (ab, l, u), l/u being the lower/upper bandwidths.
+        With (B, n) params and (B, m) knots, ab is (B, l + u + 1, n) and
+        l/u cover every matrix of the batch.
+    '''
+
+    batch = np.ndim(params) == 2
+    params, knots = np.atleast_2d(params), np.atleast_2d(knots)
+    B, n = params.shape
+    if B == 1:
+        spans = find_spans(params[0], knots[0], degree)[None]
+    else:
+        spans = batch_find_spans(params, knots, degree)
+    # Offsetting spans by row lets the 1D recurrence index the flattened knots
+    offsets = knots.shape[1] * np.arange(B)[:, None]
+    basis = basis_functions(params.ravel(), (spans + offsets).ravel(), knots.ravel(), degree)
+    rows = np.repeat(np.arange(n), degree + 1)
+    cols = span_indices(spans.ravel(), degree).reshape(B, -1)
+
+    l = max(0, int(np.max(rows - cols)))
+    u = max(0, int(np.max(cols - rows)))
+    ab = np.zeros((B, l + u + 1, n))
+    ab[np.arange(B)[:, None], u + rows - cols, cols] = basis.reshape(B, -1)
+    return (ab if batch else ab[0]), l, u
+
+
+def lu_factor_banded(ab: np.ndarray, l: int, u: int, previous: Optional[np.ndarray] = None,
+                     start: int = 0) -> np.ndarray:
+    '''
+        Banded LU without pivoting, fine for B-spline collocation matrices
+        as they are totally positive (de Boor), and for normal matrices as
+        they are positive definite.
+        Returns L (unit, below the diagonal row) and U packed in band storage.
+        ab may be a (B, l + u + 1, n) stack of equally sized matrices: every
+        elimination step then runs on the whole batch at once.
+        With previous, the factorization of a matrix whose first start
+        columns are identical to those of ab, the kept columns are reused and
+        only their updates to the remaining ones are replayed.
+    '''
+
+    lu = np.array(ab, dtype=np.float64)
+    stack = lu.reshape(-1, *lu.shape[-2:])
+    n = lu.shape[-1]
+    if previous is None:
+        start = 0
+    else:
+        # columns near the old end had a truncated lower band
+        start = max(0, min(start, n, previous.shape[-1] - l))
+    if start > 0:
+        lu[..., :start] = previous[..., :start]
+        for k in range(max(0, start - u), start):
+            _eliminate(stack, l, u, k, start - k)
+
+    for k in range(start, n):
+        pivot = stack[:, u, k]
+        if np.any(pivot == 0.0):
+            raise np.linalg.LinAlgError(f"Zero pivot at row {k}")
+        m = min(l, n - 1 - k)
+        if m == 0:
+            continue
+        stack[:, u + 1:u + 1 + m, k] /= pivot[:, None]
+        _eliminate(stack, l, u, k, 1)
+    return lu
+
+
+def _eliminate(lu: np.ndarray, l: int, u: int, k: int, first: int) -> None:
+    # A[k + 1 + a, k + j] -= L[k + 1 + a, k] * U[k, k + j] for first <= j <= u in one operation
+    # on a (B, l + u + 1, n) stack: in band storage A[k + 1 + a, k + j] sits at flat offset
+    # (u + 1 + a) * n + k + j * (1 - n), so the updated block and the pivot row are strided views
+    n = lu.shape[2]
+    m, last = min(l, n - 1 - k), min(u, n - 1 - k)
+    if m == 0 or last < first:
+        return
+    item = lu.itemsize
+    block = as_strided(lu[:, u + 1 - first, k + first:], shape=(len(lu), m, last - first + 1),
+                       strides=(lu.strides[0], n * item, (1 - n) * item))
+    row = as_strided(lu[:, u - first, k + first:], shape=(len(lu), 1, last - first + 1),
+                     strides=(lu.strides[0], 0, (1 - n) * item))
+    block -= lu[:, u + 1:u + 1 + m, k, None] * row
+
+
+def lu_solve_banded(lu: np.ndarray, l: int, u: int, b: np.ndarray) -> np.ndarray:
+    # Solves A x = b from lu_factor_banded output, b is (n,) or (n, ...),
+    # or (B, n, ...) for a (B, l + u + 1, n) stack of factorizations
+    n = lu.shape[-1]
+    stack = lu.reshape(-1, *lu.shape[-2:])
+    x = np.array(b, dtype=np.float64).reshape(len(stack), n, -1)
+
+    for k in range(n - 1):
+        m = min(l, n - 1 - k)
+        x[:, k + 1:k + 1 + m] -= stack[:, u + 1:u + 1 + m, k, None] * x[:, k, None]
+
+    for k in range(n - 1, -1, -1):
+        x[:, k] /= stack[:, u, k, None]
+        m = min(u, k)
+        x[:, k - m:k] -= stack[:, u - m:u, k, None] * x[:, k, None]
+
+    return x.reshape(np.shape(b))
+
+
+def bands_to_dense(ab: np.ndarray, l: int, u: int) -> np.ndarray:
+    # Inverse of the band storage ab[u + i - j, j] = A[i, j]
+    n = ab.shape[1]
+    A = np.zeros((n, n))
+    for r in range(l + u + 1):
+        offset = r - u  # i - j
+        j = np.arange(max(0, -offset), min(n, n - offset))
+        A[j + offset, j] = ab[r, j]
+    return A
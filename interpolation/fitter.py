@@ -1,14 +1,286 @@
 import numpy as np
+from dataclasses import dataclass
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import List, Literal, Optional, Sequence, Tuple
+from nurbs import profiling
 from nurbs.curve import NURBSCurve
+from nurbs.batch import NURBSCurveBatch
+from nurbs.basis import SparseBasis, accumulate_bands, basis_matrix, float_dtype, output_buffer
+from interpolation.banded import (collocation_bands, lu_factor_banded, lu_solve_banded,
+                                  bands_to_dense)
+
+Solver = Literal["banded", "dense"]
+BatchParameterization = Literal["mean_chord", "chord", "uniform"]
+
+
+@dataclass
+class FitStats:
+    iterations: int
+    control_points: int
+    max_error: float
+    rms_error: float
+    converged: bool  # max_error within the requested tolerance
 
 
 class NURBSFitter:
     @staticmethod
-    def interpolate(points: np.ndarray, degree: int = 3) -> NURBSCurve:
-        n = len(points)
+    def interpolate(points: np.ndarray, degree: int = 3, solver: Solver = "banded",
+                    out: Optional[np.ndarray] = None) -> NURBSCurve:
+        # out: optional (n, dim) buffer that receives the control points
+        with profiling.stage("fitter.interpolate", len(points)):
+            with profiling.stage("fitter.parameterize", len(points)):
+                params = NURBSFitter.chord_length_parameterization(np.asarray(points, dtype=np.float64))
+            with profiling.stage("fitter.knots"):
+                knots = NURBSFitter.generate_knots(params, degree)
+            return NURBSFitter.solve_constraints(points, params, knots, degree, solver, out)
+
+    @staticmethod
+    def approximate(points: np.ndarray, num_control_points: int = 20, degree: int = 3,
+                    solver: Solver = "banded", out: Optional[np.ndarray] = None) -> NURBSCurve:
+        '''
+            Least-squares curve with num_control_points control points through
+            the first and last point (Piegl & Tiller A9.1). The default matches
+            training.output_control_points in the config. out is an optional
+            (num_control_points, dim) buffer that receives the control points.
+        '''
+
+        dtype = float_dtype(points)
+        points = np.asarray(points, dtype=np.float64)
+        if not degree < num_control_points <= len(points):
+            raise ValueError("Need degree < num_control_points <= number of points")
+        with profiling.stage("fitter.approximate", len(points)):
+            with profiling.stage("fitter.parameterize", len(points)):
+                params = NURBSFitter.chord_length_parameterization(points)
+            with profiling.stage("fitter.knots"):
+                knots = NURBSFitter.approximation_knots(params, num_control_points, degree)
+            control_points = output_buffer((num_control_points, points.shape[1]), dtype, out)
+            control_points[...] = NURBSFitter.solve_least_squares(points, params, knots, degree, solver)
+        return NURBSCurve(
+            control_points=control_points,
+            weights=np.ones(num_control_points, dtype=dtype),
+            knots=knots,
+            degree=degree
+        )
+
+    @staticmethod
+    def approximate_rational(points: np.ndarray, num_control_points: int = 20, degree: int = 3,
+                             iterations: int = 50, reparameterize: bool = True,
+                             tolerance: float = 1e-6) -> NURBSCurve:
+        '''
+            Least-squares rational curve: weights are optimized along with the
+            control points, so conics and helices need far fewer of them.
+            Weights start from the homogeneous linearized fit (eliminating the
+            control points from sum N_j w_j (P_j - Q) = 0 leaves an eigenproblem
+            in w, Ma & Kruth) and control points from pinned least squares in
+            that rational basis. Damped Gauss-Newton steps on (P, log w) then
+            refine both, log w keeping the weights positive. With
+            reparameterize, parameters follow the foot points and only the
+            normal part of the residual counts, so the true distance is
+            minimized. Stops when the squared error improves by less than
+            tolerance (relative).
+        '''
+
+        points = np.asarray(points, dtype=np.float64)
+        if not degree < num_control_points <= len(points):
+            raise ValueError("Need degree < num_control_points <= number of points")
+        params = NURBSFitter.chord_length_parameterization(points)
+        knots = NURBSFitter.approximation_knots(params, num_control_points, degree)
+        basis = SparseBasis.from_knots(params, knots, degree)
+        weights = NURBSFitter._linearized_weights(basis, points)
+        control_points = NURBSFitter._rational_least_squares(basis, points, weights)[0]
+        curve = NURBSCurve(control_points, weights, knots, degree)
+        params, error = NURBSFitter._rational_error(curve, points, params, reparameterize)
+
+        n, dim = control_points.shape
+        width = (degree + 1) * (dim + 1)
+        pinned = np.concatenate([np.arange(dim), (n - 1) * (dim + 1) + np.arange(dim)])
+        damping = 1e-3
+        for _ in range(iterations):
+            # Unknowns interleaved per control point: (P_j, log w_j), dim + 1 each
+            basis = SparseBasis.from_knots(params, knots, degree)
+            rational = NURBSFitter._rational_basis(basis, curve.weights)
+            fitted, velocity = curve.derivatives(params, order=1)
+            projector = np.broadcast_to(np.eye(dim), (len(points), dim, dim))
+            if reparameterize:
+                tangent = velocity / np.linalg.norm(velocity, axis=1, keepdims=True)
+                projector = projector - tangent[:, :, None] * tangent[:, None, :]
+            residual = np.einsum('kef,kf->ke', projector, fitted - points)
+            offsets = curve.control_points[basis.indices] - fitted[:, None]
+            columns = (basis.indices[:, :, None] * (dim + 1) + np.arange(dim + 1)).reshape(-1, width)
+
+            d_points = rational.values[:, None, :, None] * projector[:, :, None, :]
+            d_weights = rational.values[:, None] * np.einsum('kef,kjf->kej', projector, offsets)
+            jacobian = np.concatenate([d_points, d_weights[..., None]], axis=3).reshape(-1, dim, width)
+            ab = accumulate_bands(columns, np.einsum('kea,keb->kab', jacobian, jacobian), n * (dim + 1))
+            gradient = np.bincount(columns.ravel(), minlength=n * (dim + 1),
+                                   weights=np.einsum('kea,ke->ka', jacobian, residual).ravel())
+            ab[width - 1] += damping * ab[width - 1] + 1e-12 * ab[width - 1].mean()
+            ab[width - 1, pinned] += 1e12 * ab[width - 1].mean()
+            step = lu_solve_banded(lu_factor_banded(ab, width - 1, width - 1),
+                                   width - 1, width - 1, -gradient).reshape(n, dim + 1)
+
+            trial_weights = curve.weights * np.exp(step[:, -1])
+            trial = NURBSCurve(curve.control_points + step[:, :-1],
+                               trial_weights / np.exp(np.mean(np.log(trial_weights))), knots, degree)
+            trial_params, trial_error = NURBSFitter._rational_error(trial, points, params, reparameterize)
+            if trial_error >= error:
+                damping *= 4
+                if damping > 1e8:
+                    break
+                continue
+            improvement = (error - trial_error) / error
+            curve, params, error, damping = trial, trial_params, trial_error, damping / 3
+            if improvement <= tolerance:
+                break
+
+        return curve
+
+    @staticmethod
+    def approximate_adaptive(points: np.ndarray, tolerance: float, degree: int = 3,
+                             max_control_points: Optional[int] = None,
+                             max_iterations: int = 50) -> Tuple[NURBSCurve, FitStats]:
+        '''
+            Least-squares curve with as few control points as greedy refinement
+            needs to keep every point within tolerance (max deviation at its
+            parameter). Starts from a single Bezier segment, then splits every
+            span holding points over tolerance at the median parameter of its
+            points and refits. Basis rows, normal matrix columns and the
+            factorization ahead of the first changed span are reused.
+        '''
+
+        points = np.asarray(points, dtype=np.float64)
         params = NURBSFitter.chord_length_parameterization(points)
-        knots = NURBSFitter.generate_knots(params, degree)
-        return NURBSFitter.solve_constraints(points, params, knots, degree)
+        limit = len(points) if max_control_points is None else min(max_control_points, len(points))
+        knots = np.concatenate([np.zeros(degree + 1), np.ones(degree + 1)])
+        basis = SparseBasis.from_knots(params, knots, degree)
+        ab, rhs = basis.gram_bands(), basis.rmatmul(points)
+        lu, keep = None, 0
+
+        for iteration in range(1, max_iterations + 1):
+            control_points, lu = NURBSFitter._solve_pinned_normal(
+                ab, rhs, points[0], points[-1], degree, lu, max(keep - 1, 0))
+            error = np.linalg.norm(basis.matmul(control_points) - points, axis=1)
+            if error.max() <= tolerance or basis.n >= limit or iteration == max_iterations:
+                break
+
+            spans = basis.indices[:, -1]
+            span_error = np.zeros(len(knots))
+            np.maximum.at(span_error, spans, error)
+            bad = np.flatnonzero(span_error > tolerance)
+            middle = params[(np.searchsorted(spans, bad, side='left') +
+                             np.searchsorted(spans, bad, side='right')) // 2]
+            valid = (middle > knots[bad]) & (middle < knots[bad + 1])
+            bad, middle = bad[valid], middle[valid]
+            if len(bad) == 0:
+                break
+            worst_first = np.argsort(-span_error[bad], kind='stable')[:limit - basis.n]
+            bad, middle = bad[worst_first], middle[worst_first]
+
+            # Basis functions before min(bad) - degree are untouched, and so
+            # are normal matrix columns up to degree before that
+            keep = max(0, int(bad.min()) - 2 * degree)
+            knots = np.sort(np.concatenate([knots, middle]))
+            row = np.searchsorted(spans, keep, side='left')
+            tail = SparseBasis.from_knots(params[row:], knots, degree)
+            basis = SparseBasis(
+                indices=np.concatenate([basis.indices[:row], tail.indices]),
+                values=np.concatenate([basis.values[:row], tail.values]),
+                n=tail.n
+            )
+            ab = np.concatenate([ab[:, :keep], tail.gram_bands()[:, keep:]], axis=1)
+            rhs = np.concatenate([rhs[:keep], tail.rmatmul(points[row:])[keep:]])
+
+        curve = NURBSCurve(
+            control_points=control_points,
+            weights=np.ones(len(control_points)),
+            knots=knots,
+            degree=degree
+        )
+        stats = FitStats(iteration, len(control_points), float(error.max()),
+                         float(np.sqrt(np.mean(error ** 2))), bool(error.max() <= tolerance))
+        return curve, stats
+
+    @staticmethod
+    def interpolate_batch(points: np.ndarray, degree: int = 3,
+                          parameterization: BatchParameterization = "mean_chord",
+                          solver: Solver = "banded",
+                          out: Optional[np.ndarray] = None) -> NURBSCurveBatch:
+        '''
+            Interpolates B same-sized point clouds, points is (B, n, dim).
+            parameterization:
+                "mean_chord": chord length averaged over the batch, one knot
+                              vector and one factorization for every curve
+                "uniform": evenly spaced parameters, shared as well
+                "chord": per-curve chord length, curves with identical
+                         parameters share knots and factorization, and the
+                         banded solver factors all distinct systems at once
+            out is an optional (B, n, dim) buffer for the control points.
+        '''
+
+        dtype = float_dtype(points)
+        points = np.asarray(points, dtype=np.float64)
+        with profiling.stage("fitter.interpolate_batch", len(points) * points.shape[1]):
+            with profiling.stage("fitter.parameterize", len(points) * points.shape[1]):
+                params = NURBSFitter.batch_chord_length_parameterization(points)
+            match parameterization:
+                case "mean_chord":
+                    params = params.mean(axis=0, keepdims=True)
+                    groups = np.zeros(len(points), dtype=np.intp)
+                case "uniform":
+                    params = np.linspace(0, 1, points.shape[1])[None]
+                    groups = np.zeros(len(points), dtype=np.intp)
+                case "chord":
+                    params, groups = np.unique(params, axis=0, return_inverse=True)
+                case _:
+                    raise ValueError(f"Unknown parameterization: {parameterization}")
+
+            groups = groups.ravel()
+            control_points = output_buffer(points.shape, dtype, out)
+            knots = np.empty((len(points), points.shape[1] + degree + 1))
+            if solver == "banded" and len(params) > 1:
+                with profiling.stage("fitter.knots"):
+                    group_knots = NURBSFitter.generate_knots(params, degree)
+                control_points[...] = NURBSFitter.solve_collocation_batch(
+                    points, params, group_knots, degree, groups)
+                knots[...] = group_knots[groups]
+            else:
+                for group, group_params in enumerate(params):
+                    members = np.flatnonzero(groups == group)
+                    with profiling.stage("fitter.knots"):
+                        group_knots = NURBSFitter.generate_knots(group_params, degree)
+                    solved = NURBSFitter.solve_collocation(
+                        points[members].transpose(1, 0, 2), group_params,
+                        group_knots, degree, solver)
+                    control_points[members] = solved.transpose(1, 0, 2)
+                    knots[members] = group_knots
+
+        return NURBSCurveBatch(
+            control_points=control_points,
+            weights=np.ones(points.shape[:2], dtype=dtype),
+            knots=knots,
+            degree=degree
+        )
+
+    @staticmethod
+    def interpolate_grouped(point_clouds: Sequence[np.ndarray], degree: int = 3,
+                            parameterization: BatchParameterization = "mean_chord",
+                            solver: Solver = "banded"
+                            ) -> List[Tuple[np.ndarray, NURBSCurveBatch]]:
+        '''
+            Interpolates point clouds of differing sizes by grouping them by
+            shape. Returns (indices into point_clouds, batch) per group.
+        '''
+
+        shapes = {}
+        for i, cloud in enumerate(point_clouds):
+            shapes.setdefault(np.shape(cloud), []).append(i)
+
+        return [
+            (np.array(indices), NURBSFitter.interpolate_batch(
+                np.stack([point_clouds[i] for i in indices]),
+                degree, parameterization, solver))
+            for indices in shapes.values()
+        ]
 
     @staticmethod
     def chord_length_parameterization(points: np.ndarray) -> np.ndarray:
@@ -20,14 +292,42 @@ class NURBSFitter:
         cumsum = np.insert(np.cumsum(distances)/total, 0, 0)
         return cumsum
 
+    @staticmethod
+    def batch_chord_length_parameterization(points: np.ndarray) -> np.ndarray:
+        # chord_length_parameterization over (B, n, dim) -> (B, n)
+        distances = np.linalg.norm(np.diff(points, axis=1), axis=2)
+        total = distances.sum(axis=1, keepdims=True)
+        cumsum = np.cumsum(distances, axis=1) / np.where(total == 0, 1, total)
+        params = np.concatenate([np.zeros((len(points), 1)), cumsum], axis=1)
+        degenerate = total[:, 0] == 0
+        params[degenerate] = np.linspace(0, 1, points.shape[1])
+        return params
+
     @staticmethod
     def generate_knots(params: np.ndarray, degree: int) -> np.ndarray:
-        n = len(params)
-        internal = np.zeros(n - degree - 1)
-        for i in range(len(internal)):
-            start = i + 1
-            end = start + degree
-            internal[i] = np.mean(params[start:end])
+        # Averaging (Piegl & Tiller eq. 9.8): mean of every degree consecutive inner params,
+        # params is (n,) or (B, n) for one knot vector per row
+        ends = np.zeros(np.shape(params)[:-1] + (degree + 1,))
+        if np.shape(params)[-1] - 2 < degree:
+            # n == degree + 1 points: a single Bezier segment, no internal knots
+            internal = ends[..., :0]
+        else:
+            internal = sliding_window_view(params[..., 1:-1], degree, axis=-1).mean(axis=-1)
+        return np.concatenate([
+            ends,
+            internal,
+            ends + 1
+        ], axis=-1)
+
+    @staticmethod
+    def approximation_knots(params: np.ndarray, num_control_points: int,
+                            degree: int) -> np.ndarray:
+        # Internal knots spread so every span holds parameters (Piegl & Tiller eq. 9.68-9.69)
+        spacing = len(params) / (num_control_points - degree)
+        position = np.arange(1, num_control_points - degree) * spacing
+        i = position.astype(np.intp)
+        alpha = position - i
+        internal = (1 - alpha) * params[i - 1] + alpha * params[i]
         return np.concatenate([
             np.zeros(degree + 1),
             internal,
@@ -36,26 +336,173 @@ class NURBSFitter:
 
     @staticmethod
     def solve_constraints(points: np.ndarray, params: np.ndarray,
-                          knots: np.ndarray, degree: int) -> NURBSCurve:
-        n = len(points)
-        A = np.zeros((n, n))
-        temp_nurbs = NURBSCurve(
-            control_points=np.zeros((n, points.shape[1])),
-            weights=np.ones(n),
-            knots=knots,
-            degree=degree
-        )
-
-        for i, t in enumerate(params):
-            span = temp_nurbs.find_span(t)
-            basis = temp_nurbs.basis_functions(span, t)
-            for j in range(degree + 1):
-                col = span - degree + j
-                A[i, col] = basis[j]
+                          knots: np.ndarray, degree: int, solver: Solver = "banded",
+                          out: Optional[np.ndarray] = None) -> NURBSCurve:
+        '''
+            Solves the collocation system A @ control_points = points.
+            The solve runs in float64; the control points (written into out
+            when given) keep the dtype of points, float32 or float64.
+            solver:
+                "banded": A kept in band storage, O(n * degree^2) banded LU
+                "dense": full n x n matrix and np.linalg.lstsq (for comparison)
+        '''
 
+        dtype = float_dtype(points)
+        control_points = output_buffer(np.shape(points), dtype, out)
+        control_points[...] = NURBSFitter.solve_collocation(np.asarray(points, dtype=np.float64),
+                                                            params, knots, degree, solver)
         return NURBSCurve(
-            control_points=np.linalg.lstsq(A, points, rcond=None)[0],
-            weights=np.ones(n),
+            control_points=control_points,
+            weights=np.ones(len(points), dtype=dtype),
             knots=knots,
             degree=degree
         )
+
+    @staticmethod
+    def solve_collocation(points: np.ndarray, params: np.ndarray,
+                          knots: np.ndarray, degree: int,
+                          solver: Solver = "banded") -> np.ndarray:
+        # Right-hand side points is (n, ...), extra axes are solved with one factorization
+        match solver:
+            case "banded":
+                with profiling.stage("fitter.build_matrix", len(params)):
+                    ab, l, u = collocation_bands(params, knots, degree)
+                with profiling.stage("fitter.solve", np.size(points) // np.shape(points)[-1]):
+                    return lu_solve_banded(lu_factor_banded(ab, l, u), l, u, points)
+            case "dense":
+                with profiling.stage("fitter.build_matrix", len(params)):
+                    A = basis_matrix(params, knots, degree)
+                with profiling.stage("fitter.solve", np.size(points) // np.shape(points)[-1]):
+                    rhs = np.reshape(points, (len(points), -1))
+                    return np.linalg.lstsq(A, rhs, rcond=None)[0].reshape(np.shape(points))
+            case _:
+                raise ValueError(f"Unknown solver: {solver}")
+
+    @staticmethod
+    def solve_collocation_batch(points: np.ndarray, params: np.ndarray, knots: np.ndarray,
+                                degree: int, groups: Optional[np.ndarray] = None) -> np.ndarray:
+        '''
+            Banded collocation solves of B systems of the same size: points is
+            (B, n, ...), params (G, n) and knots (G, m) hold the G distinct
+            systems and groups (B,) which of them each curve uses (default:
+            its own, G = B). The G factorizations share their band layout, so
+            each elimination step runs on all of them at once.
+        '''
+
+        with profiling.stage("fitter.build_matrix", np.size(params)):
+            ab, l, u = collocation_bands(params, knots, degree)
+        with profiling.stage("fitter.solve", np.size(points) // np.shape(points)[-1]):
+            lu = lu_factor_banded(ab, l, u)
+            return lu_solve_banded(lu if groups is None else lu[groups], l, u, points)
+
+    @staticmethod
+    def solve_least_squares(points: np.ndarray, params: np.ndarray,
+                            knots: np.ndarray, degree: int,
+                            solver: Solver = "banded") -> np.ndarray:
+        '''
+            Control points minimizing sum |C(params) - points|^2 with the end
+            control points pinned to the end points. points is (m, ...), extra
+            axes are solved with one factorization.
+            solver:
+                "banded": normal equations accumulated in band storage from
+                          the batched basis, O(m * degree^2 + n * degree^2)
+                "dense": full m x n matrix and np.linalg.lstsq (for comparison)
+        '''
+
+        match solver:
+            case "banded":
+                with profiling.stage("fitter.build_matrix", len(params)):
+                    basis = SparseBasis.from_knots(params, knots, degree)
+                    ab, rhs = basis.gram_bands(), basis.rmatmul(points)
+                with profiling.stage("fitter.solve", np.size(points) // np.shape(points)[-1]):
+                    return NURBSFitter._solve_pinned_normal(ab, rhs, points[0], points[-1], degree)[0]
+            case "dense":
+                with profiling.stage("fitter.build_matrix", len(params)):
+                    A = basis_matrix(params, knots, degree)
+                with profiling.stage("fitter.solve", np.size(points) // np.shape(points)[-1]):
+                    rhs = points - np.multiply.outer(A[:, 0], points[0]) - np.multiply.outer(A[:, -1], points[-1])
+                    inner = np.linalg.lstsq(A[:, 1:-1], np.reshape(rhs, (len(points), -1)), rcond=None)[0]
+                    inner = inner.reshape((A.shape[1] - 2,) + np.shape(points)[1:])
+                    return np.concatenate([points[:1], inner, points[-1:]])
+            case _:
+                raise ValueError(f"Unknown solver: {solver}")
+
+    @staticmethod
+    def _solve_pinned_normal(ab: np.ndarray, rhs: np.ndarray, first: np.ndarray, last: np.ndarray,
+                             degree: int, previous: Optional[np.ndarray] = None,
+                             start: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        '''
+            Solves banded normal equations (ab, rhs) for the inner control
+            points, the end ones pinned to first/last. Returns (control points,
+            inner factorization), see lu_factor_banded for previous/start.
+        '''
+
+        n = ab.shape[1]
+        control_points = np.empty((n,) + np.shape(first))
+        control_points[0], control_points[-1] = first, last
+        if n == 2:
+            return control_points, None
+
+        rhs = np.array(rhs, dtype=np.float64)
+        head = np.arange(1, min(degree, n - 2) + 1)
+        tail = np.arange(max(1, n - 1 - degree), n - 1)
+        rhs[head] -= np.multiply.outer(ab[degree + head, 0], first)
+        rhs[tail] -= np.multiply.outer(ab[degree + tail - n + 1, n - 1], last)
+        lu = lu_factor_banded(ab[:, 1:n - 1], degree, degree, previous, start)
+        control_points[1:-1] = lu_solve_banded(lu, degree, degree, rhs[1:n - 1])
+        return control_points, lu
+
+    @staticmethod
+    def _rational_basis(basis: SparseBasis, weights: np.ndarray) -> SparseBasis:
+        # R_j = N_j w_j / sum_k N_k w_k on the same rows and columns
+        values = basis.values * weights[basis.indices]
+        return SparseBasis(basis.indices, values / values.sum(axis=1, keepdims=True), basis.n)
+
+    @staticmethod
+    def _rational_least_squares(basis: SparseBasis, points: np.ndarray,
+                                weights: np.ndarray) -> Tuple[np.ndarray, float]:
+        # Pinned least-squares control points for fixed weights -> (control points, squared error)
+        rational = NURBSFitter._rational_basis(basis, weights)
+        degree = basis.values.shape[1] - 1
+        control_points = NURBSFitter._solve_pinned_normal(
+            rational.gram_bands(), rational.rmatmul(points), points[0], points[-1], degree)[0]
+        return control_points, float(np.sum((rational.matmul(control_points) - points) ** 2))
+
+    @staticmethod
+    def _rational_error(curve: NURBSCurve, points: np.ndarray, params: np.ndarray,
+                        reparameterize: bool, steps: int = 3) -> Tuple[np.ndarray, float]:
+        # Squared error at params, moved by Newton steps towards the foot points if reparameterize
+        low, high = curve.knots[curve.degree], curve.knots[-curve.degree - 1]
+        for _ in range(steps if reparameterize else 0):
+            fitted, d1, d2 = curve.derivatives(params, order=2)
+            offset = fitted - points
+            speed2 = np.sum(d1 * d1, axis=1)
+            slope = speed2 + np.sum(offset * d2, axis=1)
+            slope = np.where(slope > 0, slope, speed2)
+            params = np.clip(params - np.sum(offset * d1, axis=1) / slope, low, high)
+        return params, float(np.sum((curve.evaluate_many(params) - points) ** 2))
+
+    @staticmethod
+    def _linearized_weights(basis: SparseBasis, points: np.ndarray) -> np.ndarray:
+        '''
+            Weights minimizing the algebraic error sum_i |sum_j N_j(t_i) w_j (P_j - Q_i)|^2
+            with the weighted control points eliminated: the smallest
+            eigenvector of sum_d C_d - B_d G^-1 B_d, G = N.T N, B_d = N.T Q_d N,
+            C_d = N.T Q_d^2 N. Falls back to unit weights if it changes sign.
+        '''
+
+        degree = basis.values.shape[1] - 1
+        points = points - points.mean(axis=0)
+        points = points / max(np.abs(points).max(), np.finfo(float).tiny)
+        G = bands_to_dense(basis.gram_bands(), degree, degree)
+        S = np.zeros_like(G)
+        for coordinate in points.T:
+            B = bands_to_dense(basis.gram_bands(coordinate), degree, degree)
+            C = bands_to_dense(basis.gram_bands(coordinate ** 2), degree, degree)
+            S += C - B @ np.linalg.solve(G, B)
+
+        weights = np.linalg.eigh(S)[1][:, 0]
+        weights *= np.sign(weights.sum())
+        if weights.min() <= 0:
+            return np.ones(basis.n)
+        return weights / np.exp(np.mean(np.log(weights)))
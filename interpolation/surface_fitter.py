@@ -0,0 +1,138 @@
+import numpy as np
+from typing import Optional, Tuple
+from nurbs.surface import NURBSSurface
+from nurbs.basis import SparseBasis
+from interpolation.banded import lu_factor_banded, lu_solve_banded
+from interpolation.fitter import NURBSFitter, Solver
+
+
+class NURBSSurfaceFitter:
+    @staticmethod
+    def fit_grid(points: np.ndarray, num_control_points: Optional[Tuple[int, int]] = None,
+                 degree_u: int = 3, degree_v: int = 3, solver: Solver = "banded") -> NURBSSurface:
+        '''
+            Fits a (rows, cols, dim) grid of points as two separable curve
+            systems (Piegl & Tiller A9.4): every column is solved along u with
+            one factorization, then every row of the result along v.
+            num_control_points=None interpolates the grid, otherwise each
+            direction is a least-squares approximation with pinned ends.
+        '''
+
+        points = np.asarray(points, dtype=np.float64)
+        rows, cols = points.shape[:2]
+        params_u = NURBSFitter.batch_chord_length_parameterization(points.transpose(1, 0, 2)).mean(axis=0)
+        params_v = NURBSFitter.batch_chord_length_parameterization(points).mean(axis=0)
+
+        if num_control_points is None:
+            knots_u = NURBSFitter.generate_knots(params_u, degree_u)
+            knots_v = NURBSFitter.generate_knots(params_v, degree_v)
+            solve = NURBSFitter.solve_collocation
+        else:
+            if not (degree_u < num_control_points[0] <= rows and degree_v < num_control_points[1] <= cols):
+                raise ValueError("Need degree < num_control_points <= number of points per direction")
+            knots_u = NURBSFitter.approximation_knots(params_u, num_control_points[0], degree_u)
+            knots_v = NURBSFitter.approximation_knots(params_v, num_control_points[1], degree_v)
+            solve = NURBSFitter.solve_least_squares
+
+        strips = solve(points, params_u, knots_u, degree_u, solver)             # (nu, cols, dim)
+        net = solve(strips.transpose(1, 0, 2), params_v, knots_v, degree_v, solver)  # (nv, nu, dim)
+        return NURBSSurface(
+            control_points=np.ascontiguousarray(net.transpose(1, 0, 2)),
+            weights=np.ones(net.shape[1::-1]),
+            knots_u=knots_u,
+            knots_v=knots_v,
+            degree_u=degree_u,
+            degree_v=degree_v
+        )
+
+    @staticmethod
+    def fit_scattered(points: np.ndarray, params: Optional[np.ndarray] = None,
+                      num_control_points: Tuple[int, int] = (20, 20),
+                      degree_u: int = 3, degree_v: int = 3, smoothing: float = 1e-6,
+                      chunk_size: int = 1 << 14) -> NURBSSurface:
+        '''
+            Least-squares surface through (k, dim) scattered points at (k, 2)
+            parameters, plane_parameterization(points) when not given.
+            Each point touches (degree_u + 1) * (degree_v + 1) control points,
+            so the normal equations are accumulated per knot cell in chunks of
+            chunk_size points: memory depends on the control net, not on k.
+            The system is block-banded (bandwidth degree_u * nv + degree_v)
+            and is factored in band storage with lu_factor_banded.
+            smoothing weights a membrane term (first differences of the
+            control net, relative to the mean diagonal) that keeps control
+            points without nearby data well defined.
+        '''
+
+        points = np.asarray(points, dtype=np.float64)
+        params = NURBSSurfaceFitter.plane_parameterization(points) if params is None else \
+            np.asarray(params, dtype=np.float64)
+        nu, nv = num_control_points
+        knots_u = NURBSFitter.approximation_knots(np.sort(params[:, 0]), nu, degree_u)
+        knots_v = NURBSFitter.approximation_knots(np.sort(params[:, 1]), nv, degree_v)
+
+        # Normal equations of every knot cell, local (degree + 1)^2 control points each
+        local = (degree_u + 1) * (degree_v + 1)
+        cells = (nu - degree_u) * (nv - degree_v)
+        dim = points.shape[1]
+        gram = np.zeros(cells * local * local)
+        rhs = np.zeros(cells * local * dim)
+        for start in range(0, len(points), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            basis_u = SparseBasis.from_knots(params[chunk, 0], knots_u, degree_u)
+            basis_v = SparseBasis.from_knots(params[chunk, 1], knots_v, degree_v)
+            cell = basis_u.indices[:, 0] * (nv - degree_v) + basis_v.indices[:, 0]
+            values = np.einsum('ka,kb->kab', basis_u.values, basis_v.values).reshape(len(cell), local)
+
+            slots = cell[:, None] * local * local + np.arange(local * local)
+            gram += np.bincount(slots.ravel(), weights=(values[:, :, None] * values[:, None]).ravel(),
+                                minlength=len(gram))
+            slots = cell[:, None] * local * dim + np.arange(local * dim)
+            rhs += np.bincount(slots.ravel(), weights=(values[:, :, None] * points[chunk, None]).ravel(),
+                               minlength=len(rhs))
+
+        # Scatter the cells into the (nu * nv) system, block-banded in band storage
+        # ab[w + i - j, j] = A[i, j]: control points (i, j) and (i', j') only meet
+        # in a cell when |i - i'| <= degree_u and |j - j'| <= degree_v
+        n = nu * nv
+        width = max(degree_u * nv + degree_v, nv)
+        first_u, first_v = np.divmod(np.arange(cells), nv - degree_v)
+        offsets = (np.arange(degree_u + 1)[:, None] * nv + np.arange(degree_v + 1)).ravel()
+        index = (first_u * nv + first_v)[:, None] + offsets
+        slots = (width + index[:, :, None] - index[:, None, :]) * n + index[:, None, :]
+        ab = np.bincount(slots.ravel(), weights=gram, minlength=(2 * width + 1) * n).reshape(2 * width + 1, n)
+        b = np.bincount((index[:, :, None] * dim + np.arange(dim)).ravel(), weights=rhs,
+                        minlength=n * dim).reshape(n, dim)
+
+        ab += smoothing * ab[width].mean() * _membrane_bands(nu, nv, width)
+        lu = lu_factor_banded(ab, width, width)
+        control_points = lu_solve_banded(lu, width, width, b).reshape(nu, nv, dim)
+        return NURBSSurface(
+            control_points=control_points,
+            weights=np.ones((nu, nv)),
+            knots_u=knots_u,
+            knots_v=knots_v,
+            degree_u=degree_u,
+            degree_v=degree_v
+        )
+
+    @staticmethod
+    def plane_parameterization(points: np.ndarray) -> np.ndarray:
+        # Coordinates in the best-fit plane (two main principal axes) scaled to [0, 1]^2
+        centered = points - points.mean(axis=0)
+        axes = np.linalg.svd(centered.T @ centered)[0][:, :2]
+        uv = centered @ axes
+        low, high = uv.min(axis=0), uv.max(axis=0)
+        return (uv - low) / np.where(high > low, high - low, 1)
+
+
+def _membrane_bands(nu: int, nv: int, width: int) -> np.ndarray:
+    # First difference Gram matrix of the (nu, nv) net along u and v, in band storage of width
+    n = nu * nv
+    u, v = np.divmod(np.arange(n), nv)
+    ab = np.zeros((2 * width + 1, n))
+    ab[width] = (2 - (u == 0) - (u == nu - 1)) + (2 - (v == 0) - (v == nv - 1))
+    ab[width - nv, nv:] = -1
+    ab[width + nv, :n - nv] = -1
+    ab[width - 1, 1:] = np.where(v[1:] > 0, -1.0, 0.0)
+    ab[width + 1, :-1] = np.where(v[:-1] < nv - 1, -1.0, 0.0)
+    return ab
@@ -1,32 +1,66 @@
 import argparse
 import yaml
-from demonstrations import basic, interpolation, surface, synthetic_generation
+from contextlib import nullcontext
+from importlib import import_module
+from dataset.builder import DatasetBuilder
+from nurbs import profiling
+
+# Demo modules pull in matplotlib, they are only imported when one is run
+DEMOS = {
+    'basic': 'demonstrations.basic',
+    'interpolation': 'demonstrations.interpolation',
+    'surface': 'demonstrations.surface',
+    'synthetic': 'demonstrations.synthetic_generation',
+}
 
 def main():
     parser = argparse.ArgumentParser(description="NURBS Demonstration System")
     parser.add_argument('--demo', 
-        choices=['basic', 'interpolation', 'surface', 'synthetic'],
+        choices=list(DEMOS),
         help="Demonstration to run")
     parser.add_argument('--train', action='store_true',
                       help="Train the NURBS-ML model")
+    parser.add_argument('--build-dataset', type=str, metavar='OUTPUT_DIR',
+                      help="Generate and fit a sharded synthetic dataset")
+    parser.add_argument('--batch', type=str, metavar='OUTPUT_FILE',
+                      help="Headless: generate, fit and export the synthetic dataset "
+                           "to one binary NURBS dataset file")
+    parser.add_argument('--workers', type=int, default=None,
+                      help="Worker processes for --build-dataset")
     parser.add_argument('--config', type=str, default="configs/synthetic_curve.yaml",
                       help="Path to config file")
+    parser.add_argument('--profile', type=str, nargs='?', const='-', metavar='JSON',
+                      help="Print per-stage timings, or write them to JSON "
+                           "(use --workers 1 to include --build-dataset shards)")
+    parser.add_argument('--profile-memory', action='store_true',
+                      help="Also trace allocations with --profile (slower)")
     
     args = parser.parse_args()
     
     with open(args.config) as f:
         config = yaml.safe_load(f)
 
-    if args.train:
-        pass
-    elif args.demo:
-        match args.demo:
-            case 'basic': basic.run()
-            case 'interpolation': interpolation.run()
-            case 'surface': surface.run()
-            case 'synthetic': synthetic_generation.run(config)
-    else:
-        print("Please specify either --train or --demo")
+    with profiling.profile(args.profile_memory) if args.profile else nullcontext() as report:
+        if args.train:
+            pass
+        elif args.build_dataset:
+            DatasetBuilder(config).build(args.build_dataset, args.workers)
+        elif args.batch:
+            count = DatasetBuilder(config).export(args.batch)
+            print(f"Wrote {count} curves to {args.batch}")
+        elif args.demo:
+            demo = import_module(DEMOS[args.demo])
+            if args.demo == 'synthetic':
+                demo.run(config)
+            else:
+                demo.run()
+        else:
+            print("Please specify either --train, --build-dataset, --batch or --demo")
+
+    if args.profile == '-':
+        print(report.table())
+    elif args.profile:
+        report.save(args.profile)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,134 @@
+import os
+import numpy as np
+from contextlib import contextmanager
+from importlib import import_module
+from importlib.util import find_spec
+from typing import Iterator, Literal, Optional, Tuple
+from nurbs import basis
+
+Backend = Literal["numpy", "numba"]
+
+# numba is optional and heavy to import: its kernels (nurbs.kernels) are only
+# loaded the first time something is dispatched to the "numba" backend
+_HAS_NUMBA = find_spec("numba") is not None
+_kernels = None
+
+
+def available_backends() -> Tuple[Backend, ...]:
+    return ("numpy", "numba") if _HAS_NUMBA else ("numpy",)
+
+
+def get_backend() -> Backend:
+    return _backend
+
+
+def set_backend(name: Backend) -> None:
+    global _backend
+    if name not in ("numpy", "numba"):
+        raise ValueError(f"Unknown backend: {name}")
+    if name not in available_backends():
+        raise ImportError("The numba backend needs numba installed")
+    _backend = name
+
+
+@contextmanager
+def use_backend(name: Backend) -> Iterator[None]:
+    previous = get_backend()
+    set_backend(name)
+    try:
+        yield
+    finally:
+        set_backend(previous)
+
+
+def find_spans(ts: np.ndarray, knots: np.ndarray, degree: int) -> np.ndarray:
+    ts, knots = _floats(ts), _floats(knots)
+    if _backend == "numpy":
+        return basis.find_spans(ts, knots, degree)
+    spans = np.empty(len(ts), dtype=np.intp)
+    _compiled().find_spans(ts, knots, degree, spans)
+    return spans
+
+
+def basis_functions(ts: np.ndarray, spans: np.ndarray,
+                    knots: np.ndarray, degree: int) -> np.ndarray:
+    ts, knots = _floats(ts), _floats(knots)
+    if _backend == "numpy":
+        return basis.basis_functions(ts, spans, knots, degree)
+    out = np.empty((len(ts), degree + 1))
+    _compiled().basis_functions(ts, np.asarray(spans, dtype=np.intp), knots, degree, out)
+    return out
+
+
+def curve_points(ts: np.ndarray, control_points: np.ndarray, weights: np.ndarray,
+                 knots: np.ndarray, degree: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    # Rational curve points (len(ts), dim), one fused pass per parameter under numba.
+    # Computed in float32 when control points and weights are float32
+    dtype = basis.float_dtype(control_points, weights)
+    ts, knots = _floats(ts, dtype), _floats(knots, dtype)
+    control_points, weights = _floats(control_points, dtype), _floats(weights, dtype)
+    out = basis.output_buffer((len(ts), control_points.shape[1]), dtype, out)
+    if _backend == "numpy":
+        spans = basis.find_spans(ts, knots, degree)
+        idx = basis.span_indices(spans, degree)
+        weighted = basis.basis_functions(ts, spans, knots, degree) * weights[idx]
+        points = np.einsum('ki,kid->kd', weighted, control_points[idx])
+        return np.divide(points, weighted.sum(axis=1, keepdims=True), out=out)
+    _compiled().curve_points(ts, control_points, weights, knots, degree, out)
+    return out
+
+
+def contract_points(spans: np.ndarray, basis_values: np.ndarray, control_points: np.ndarray,
+                    weights: np.ndarray, degree: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    # Rational curve points from precomputed spans (k,) and basis (k, degree + 1) -> (k, dim),
+    # so callers holding cached bases (BasisCache) only re-run the weighted contraction
+    dtype = basis.float_dtype(control_points, weights)
+    out = basis.output_buffer((len(spans), np.shape(control_points)[1]), dtype, out)
+    if _backend == "numpy":
+        idx = basis.span_indices(spans, degree)
+        weighted = basis_values * weights[idx]
+        points = np.einsum('ki,kid->kd', weighted, control_points[idx])
+        return np.divide(points, weighted.sum(axis=1, keepdims=True), out=out)
+    _compiled().contract_points(np.asarray(spans, dtype=np.intp), _floats(basis_values, dtype),
+                                _floats(control_points, dtype), _floats(weights, dtype), degree, out)
+    return out
+
+
+def surface_points(us: np.ndarray, vs: np.ndarray, control_points: np.ndarray,
+                   weights: np.ndarray, knots_u: np.ndarray, knots_v: np.ndarray,
+                   degree_u: int, degree_v: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    # Rational surface points at (us[k], vs[k]) -> (k, dim), dtype as in curve_points
+    dtype = basis.float_dtype(control_points, weights)
+    us, vs = _floats(us, dtype), _floats(vs, dtype)
+    knots_u, knots_v = _floats(knots_u, dtype), _floats(knots_v, dtype)
+    control_points, weights = _floats(control_points, dtype), _floats(weights, dtype)
+    out = basis.output_buffer((len(us), control_points.shape[2]), dtype, out)
+    if _backend == "numpy":
+        span_u = basis.find_spans(us, knots_u, degree_u)
+        span_v = basis.find_spans(vs, knots_v, degree_v)
+        basis_u = basis.basis_functions(us, span_u, knots_u, degree_u)
+        basis_v = basis.basis_functions(vs, span_v, knots_v, degree_v)
+        idx_u = basis.span_indices(span_u, degree_u)[:, :, None]
+        idx_v = basis.span_indices(span_v, degree_v)[:, None, :]
+        local = weights[idx_u, idx_v][..., None]
+        net = np.concatenate([control_points[idx_u, idx_v] * local, local], axis=-1)
+        points = np.einsum('ki,kj,kijd->kd', basis_u, basis_v, net)
+        return np.divide(points[:, :-1], points[:, -1:], out=out)
+    _compiled().surface_points(us, vs, control_points, weights, knots_u, knots_v,
+                               degree_u, degree_v, out)
+    return out
+
+
+def _compiled():
+    global _kernels
+    if _kernels is None:
+        _kernels = import_module("nurbs.kernels")
+    return _kernels
+
+
+def _floats(array: np.ndarray, dtype: np.dtype = np.float64) -> np.ndarray:
+    return np.ascontiguousarray(np.atleast_1d(array), dtype=dtype)
+
+
+_backend: Backend = "numpy"
+set_backend(os.environ.get("NURBS_BACKEND", available_backends()[-1]))
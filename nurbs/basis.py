@@ -0,0 +1,322 @@
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+def float_dtype(*arrays: np.ndarray) -> np.dtype:
+    # float32 when every array is float32, float64 otherwise (ints, float64, mixed)
+    return np.result_type(*(np.asarray(array).dtype for array in arrays), np.float32)
+
+
+def output_buffer(shape: tuple, dtype: np.dtype, out: Optional[np.ndarray] = None) -> np.ndarray:
+    # The caller's out once checked to hold exactly shape and dtype values, or a new array.
+    # Compiled kernels write through out unchecked, so this is their only bounds check
+    shape = tuple(shape)
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    if out.shape != shape:
+        raise ValueError(f"Output buffer must have shape {shape}, got {out.shape}")
+    if not np.can_cast(dtype, out.dtype, casting='same_kind'):
+        raise ValueError(f"Output buffer of dtype {out.dtype} cannot hold {np.dtype(dtype)} values")
+    return out
+
+
+def find_spans(ts: np.ndarray, knots: np.ndarray, degree: int) -> np.ndarray:
+    '''
+        Vectorized find_span: knot interval of every parameter in ts.
+        Eg:
+            knots = [0, 0, 0, 1, 2, 3, 3, 3], degree = 2
+            find_spans([0.5, 1.5, 3.0]) = [2, 3, 4]
+    '''
+
+    n = len(knots) - degree - 2
+    spans = np.searchsorted(knots, ts, side='right') - 1
+    return np.clip(spans, degree, n)
+
+
+def batch_find_spans(ts: np.ndarray, knots: np.ndarray, degree: int) -> np.ndarray:
+    # find_spans for every row of (B, k) ts against its own row of (B, m) knots:
+    # one stable row sort puts each parameter after the knots <= it
+    m = knots.shape[1]
+    order = np.argsort(np.concatenate([knots, ts], axis=1), axis=1, kind='stable')
+    knots_before = np.cumsum(order < m, axis=1)
+    is_param = order >= m
+    spans = np.empty(ts.shape, dtype=np.intp)
+    spans[np.nonzero(is_param)[0], order[is_param] - m] = knots_before[is_param] - 1
+    return np.clip(spans, degree, m - degree - 2)
+
+
+def basis_functions(ts: np.ndarray, spans: np.ndarray,
+                    knots: np.ndarray, degree: int) -> np.ndarray:
+    # Cox-de Boor recurrence run on all parameters at once -> (len(ts), degree + 1) in the dtype of ts
+
+    dtype = float_dtype(ts)
+    ts, knots = np.asarray(ts, dtype=dtype), np.asarray(knots, dtype=dtype)
+    left = np.zeros((degree + 1, len(ts)), dtype=dtype)
+    right = np.zeros((degree + 1, len(ts)), dtype=dtype)
+    N = np.zeros((degree + 1, len(ts)), dtype=dtype)
+
+    N[0] = 1.0
+    for j in range(1, degree + 1):
+        left[j] = ts - knots[spans + 1 - j]
+        right[j] = knots[spans + j] - ts
+        saved = np.zeros(len(ts), dtype=dtype)
+
+        for r in range(j):
+            temp = N[r] / (right[r + 1] + left[j - r])
+            N[r] = saved + right[r + 1] * temp
+            saved = left[j - r] * temp
+
+        N[j] = saved
+    return np.ascontiguousarray(N.T)
+
+
+def basis_derivatives(ts: np.ndarray, spans: np.ndarray, knots: np.ndarray,
+                      degree: int, order: int) -> np.ndarray:
+    '''
+        Basis functions and their derivatives up to order, all parameters at
+        once (Piegl & Tiller A2.3) -> (len(ts), order + 1, degree + 1).
+        [:, 0] equals basis_functions, orders above degree are zero.
+    '''
+
+    ts = np.asarray(ts, dtype=np.float64)
+    p = degree
+    left = np.zeros((p + 1, len(ts)))
+    right = np.zeros((p + 1, len(ts)))
+    ndu = np.zeros((p + 1, p + 1, len(ts)))  # basis (upper) and knot differences (lower)
+
+    ndu[0, 0] = 1.0
+    for j in range(1, p + 1):
+        left[j] = ts - knots[spans + 1 - j]
+        right[j] = knots[spans + j] - ts
+        saved = np.zeros(len(ts))
+
+        for r in range(j):
+            ndu[j, r] = right[r + 1] + left[j - r]
+            temp = ndu[r, j - 1] / ndu[j, r]
+            ndu[r, j] = saved + right[r + 1] * temp
+            saved = left[j - r] * temp
+
+        ndu[j, j] = saved
+
+    ders = np.zeros((order + 1, p + 1, len(ts)))
+    ders[0] = ndu[:, p]
+    for r in range(p + 1):
+        a = np.zeros((2, p + 1, len(ts)))
+        a[0, 0] = 1.0
+        s1, s2 = 0, 1
+        for k in range(1, min(order, p) + 1):
+            d = np.zeros(len(ts))
+            rk, pk = r - k, p - k
+            if r >= k:
+                a[s2, 0] = a[s1, 0] / ndu[pk + 1, rk]
+                d = a[s2, 0] * ndu[rk, pk]
+            j1 = 1 if rk >= -1 else -rk
+            j2 = k - 1 if r - 1 <= pk else p - r
+            for j in range(j1, j2 + 1):
+                a[s2, j] = (a[s1, j] - a[s1, j - 1]) / ndu[pk + 1, rk + j]
+                d = d + a[s2, j] * ndu[rk + j, pk]
+            if r <= pk:
+                a[s2, k] = -a[s1, k - 1] / ndu[pk + 1, r]
+                d = d + a[s2, k] * ndu[r, pk]
+            ders[k, r] = d
+            s1, s2 = s2, s1
+
+    factor = p
+    for k in range(1, min(order, p) + 1):
+        ders[k] *= factor
+        factor *= p - k
+    return np.ascontiguousarray(ders.transpose(2, 0, 1))
+
+
+def span_indices(spans: np.ndarray, degree: int) -> np.ndarray:
+    # Control point indices touched by each span -> (len(spans), degree + 1)
+    return spans[:, None] - degree + np.arange(degree + 1)
+
+
+def smooth_segment_bounds(ts: np.ndarray, knots: np.ndarray, degree: int,
+                          side: str = 'right') -> Tuple[np.ndarray, np.ndarray]:
+    '''
+        Bounds of the C1 piece holding each parameter: the domain is cut at
+        interior knots of multiplicity >= degree, where the curve may kink.
+        side picks the piece for parameters sitting exactly on a cut.
+    '''
+
+    inner, counts = np.unique(knots[degree + 1:-degree - 1], return_counts=True)
+    breaks = np.concatenate([[knots[degree]], inner[counts >= degree], [knots[-degree - 1]]])
+    piece = np.searchsorted(breaks, ts, side=side) - 1
+    piece = np.clip(piece, 0, len(breaks) - 2)
+    # Stop one ulp short of interior cuts so spans (and derivatives) stay on this piece
+    high = np.where(piece < len(breaks) - 2, np.nextafter(breaks[piece + 1], -np.inf), breaks[piece + 1])
+    return breaks[piece], high
+
+
+def split_at_breaks(ts: np.ndarray, knots: np.ndarray,
+                    degree: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''
+        (indices, low, high): every parameter with the bounds of its C1 piece,
+        parameters sitting on a cut are repeated once per adjacent piece.
+    '''
+
+    low, high = smooth_segment_bounds(ts, knots, degree, side='right')
+    low_left, high_left = smooth_segment_bounds(ts, knots, degree, side='left')
+    twins = np.flatnonzero(low_left != low)
+    return (np.concatenate([np.arange(len(ts)), twins]),
+            np.concatenate([low, low_left[twins]]),
+            np.concatenate([high, high_left[twins]]))
+
+
+def basis_matrix(ts: np.ndarray, knots: np.ndarray, degree: int) -> np.ndarray:
+    # Dense collocation matrix N[k, i] = N_i(ts[k]) -> (len(ts), n), float32 for float32 ts
+    ts = np.atleast_1d(np.asarray(ts))
+    ts = ts.astype(float_dtype(ts), copy=False)
+    spans = find_spans(ts, knots, degree)
+    N = np.zeros((len(ts), len(knots) - degree - 1), dtype=ts.dtype)
+    np.put_along_axis(N, span_indices(spans, degree),
+                      basis_functions(ts, spans, knots, degree), axis=1)
+    return N
+
+
+class BasisCache:
+    '''
+        Size-bounded LRU cache of (spans, basis) per parameter array.
+        Entries are keyed on the parameters and on the knot vector/degree
+        they were computed with, so editing knots (even in place) never
+        returns stale bases. Control points/weights are not part of the key:
+        moving them only re-runs the weighted contraction, which both
+        backends run from the cached bases (backend.contract_points).
+    '''
+
+    def __init__(self, maxsize: int = 8):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def lookup(self, ts: np.ndarray, knots: np.ndarray,
+               degree: int) -> Tuple[np.ndarray, np.ndarray]:
+        key = (ts.shape, ts.dtype.str, hash(ts.tobytes()), np.asarray(knots).tobytes(), degree)
+        entry = self._entries.get(key)
+        if entry is not None and np.array_equal(entry[0], ts):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+        self.misses += 1
+        spans = find_spans(ts, knots, degree)
+        basis = basis_functions(ts, spans, knots, degree)
+        if self.maxsize > 0:
+            self._entries[key] = (ts.copy(), spans, basis)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return spans, basis
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def info(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self._entries), "maxsize": self.maxsize}
+
+
+def accumulate_bands(indices: np.ndarray, blocks: np.ndarray, n: int) -> np.ndarray:
+    '''
+        Sum of local (k, w, w) blocks over consecutive columns indices (k, w)
+        into an n x n matrix in LAPACK band storage ab[w - 1 + i - j, j].
+    '''
+
+    width = indices.shape[1]
+    bands = (width - 1 + np.arange(width)[:, None] - np.arange(width)) * n
+    ab = np.zeros((2 * width - 1) * n)
+    chunk = max(1, SparseBasis.DENSE_LIMIT // (width * width))
+    for start in range(0, len(indices), chunk):
+        part = slice(start, start + chunk)
+        slots = bands + indices[part, None, :]
+        ab += np.bincount(slots.ravel(), weights=blocks[part].ravel(), minlength=len(ab))
+    return ab.reshape(2 * width - 1, n)
+
+
+@dataclass
+class SparseBasis:
+    '''
+        Basis matrix N(ts) of a fixed knot vector, stored row-compressed:
+            N[k, indices[k, i]] = values[k, i]
+        Built once, then evaluating any number of control nets sharing the
+        knots is a (rational) matrix product with no span search or recurrence.
+        Below DENSE_LIMIT entries the product runs as a dense GEMM.
+    '''
+
+    indices: np.ndarray  # (k, degree + 1)
+    values: np.ndarray   # (k, degree + 1)
+    n: int               # number of control points
+
+    DENSE_LIMIT = 1 << 22
+
+    def __post_init__(self):
+        self._dense: Optional[np.ndarray] = None
+
+    @staticmethod
+    def from_knots(ts: np.ndarray, knots: np.ndarray, degree: int) -> "SparseBasis":
+        ts = np.atleast_1d(np.asarray(ts, dtype=np.float64))
+        spans = find_spans(ts, knots, degree)
+        return SparseBasis(
+            indices=span_indices(spans, degree),
+            values=basis_functions(ts, spans, knots, degree),
+            n=len(knots) - degree - 1
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.values), self.n
+
+    def to_dense(self) -> np.ndarray:
+        if self._dense is None:
+            self._dense = np.zeros(self.shape)
+            np.put_along_axis(self._dense, self.indices, self.values, axis=1)
+        return self._dense
+
+    def matmul(self, x: np.ndarray) -> np.ndarray:
+        # N @ x for x of shape (..., n, d) -> (..., k, d)
+        if self.values.size and self.shape[0] * self.shape[1] <= self.DENSE_LIMIT:
+            return self.to_dense() @ x
+        out = np.zeros((*x.shape[:-2], self.shape[0], x.shape[-1]))
+        for i in range(self.values.shape[1]):
+            out += self.values[:, i, None] * x[..., self.indices[:, i], :]
+        return out
+
+    def rmatmul(self, x: np.ndarray) -> np.ndarray:
+        # N.T @ x for x of shape (k, ...) -> (n, ...), accumulated per basis column
+        flat = np.reshape(x, (self.shape[0], -1))
+        width = flat.shape[1]
+        out = np.zeros(self.n * width)
+        for i in range(self.values.shape[1]):
+            slots = self.indices[:, i, None] * width + np.arange(width)
+            out += np.bincount(slots.ravel(), weights=(self.values[:, i, None] * flat).ravel(),
+                               minlength=self.n * width)
+        return out.reshape((self.n,) + np.shape(x)[1:])
+
+    def gram_bands(self, weights: Optional[np.ndarray] = None) -> np.ndarray:
+        '''
+            Normal matrix N.T @ diag(weights) @ N in LAPACK band storage
+            ab[degree + i - j, j], both bandwidths being the degree. Accumulated
+            straight from the row-compressed values, the dense matrix is never
+            formed. weights=None is N.T @ N.
+        '''
+
+        rows = self.values if weights is None else self.values * weights[:, None]
+        return accumulate_bands(self.indices, rows[:, :, None] * self.values[:, None, :], self.n)
+
+    def evaluate(self, control_points: np.ndarray,
+                 weights: Optional[np.ndarray] = None) -> np.ndarray:
+        '''
+            Points of one or a batch of control nets sharing the knots:
+                control_points (..., n, dim), weights (..., n) -> (..., k, dim)
+            weights=None evaluates the non-rational B-spline.
+        '''
+
+        if weights is None:
+            return self.matmul(control_points)
+        weights = weights[..., None]
+        homogeneous = self.matmul(np.concatenate([control_points * weights, weights], axis=-1))
+        return homogeneous[..., :-1] / homogeneous[..., -1:]
@@ -0,0 +1,96 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Iterator, Optional, Sequence, Union
+from nurbs import profiling
+from nurbs.curve import NURBSCurve
+from nurbs.basis import batch_find_spans, find_spans, float_dtype, basis_functions, span_indices
+
+
+@dataclass
+class NURBSCurveBatch:
+    '''
+        B curves of identical size and degree stored in (B, ...) arrays.
+        Integer indexing returns a NURBSCurve viewing the batch memory,
+        slices (stepped ones included) return a sub-batch view; index
+        arrays and masks copy, as they do in NumPy. float32 control points
+        and weights stay float32 (evaluation included), anything else
+        becomes float64. Arrays are only copied to change their dtype.
+    '''
+
+    control_points: np.ndarray  # (B, n, dim)
+    weights: np.ndarray         # (B, n)
+    knots: np.ndarray           # (B, m)
+    degree: int
+
+    def __post_init__(self):
+        dtype = float_dtype(self.control_points, self.weights)
+        self.control_points = np.asarray(self.control_points, dtype=dtype)
+        self.weights = np.asarray(self.weights, dtype=dtype)
+        self.knots = np.asarray(self.knots, dtype=np.float64)
+        self._validate_inputs()
+
+    def _validate_inputs(self) -> None:
+        if self.control_points.ndim != 3:
+            raise ValueError("Control points must be (B, n, dim)")
+        if self.weights.shape != self.control_points.shape[:2]:
+            raise ValueError("Mismatched control points/weights")
+        if self.knots.shape != (len(self), self.control_points.shape[1] + self.degree + 1):
+            raise ValueError("Invalid knot vector length")
+
+    @staticmethod
+    def from_curves(curves: Sequence[NURBSCurve]) -> "NURBSCurveBatch":
+        return NURBSCurveBatch(
+            control_points=np.stack([curve.control_points for curve in curves]),
+            weights=np.stack([curve.weights for curve in curves]),
+            knots=np.stack([curve.knots for curve in curves]),
+            degree=curves[0].degree
+        )
+
+    def __len__(self) -> int:
+        return len(self.control_points)
+
+    def __getitem__(self, index: Union[int, slice, np.ndarray]
+                    ) -> Union[NURBSCurve, "NURBSCurveBatch"]:
+        if np.ndim(index) == 0 and not isinstance(index, slice):
+            return NURBSCurve(
+                control_points=self.control_points[index],
+                weights=self.weights[index],
+                knots=self.knots[index],
+                degree=self.degree
+            )
+        return NURBSCurveBatch(
+            control_points=self.control_points[index],
+            weights=self.weights[index],
+            knots=self.knots[index],
+            degree=self.degree
+        )
+
+    def batches(self, batch_size: int) -> Iterator["NURBSCurveBatch"]:
+        # Consecutive sub-batch views, eg. to feed a training loop
+        for start in range(0, len(self), batch_size):
+            yield self[start:start + batch_size]
+
+    def evaluate_many(self, ts: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        # ts is shared (k,) or per-curve (B, k) -> (B, k, dim), written into out when given
+        ts = np.broadcast_to(np.asarray(ts, dtype=self.control_points.dtype), (len(self), np.shape(ts)[-1]))
+        with profiling.stage("batch.evaluate_many", ts.size):
+            spans = self.find_spans(ts)
+
+            # Offsetting spans by row lets the 1D recurrence index the flattened knots
+            m = self.knots.shape[1]
+            offsets = m * np.arange(len(self))[:, None]
+            basis = basis_functions(ts.ravel(), (spans + offsets).ravel(),
+                                    self.knots.ravel(), self.degree)
+            basis = basis.reshape(*ts.shape, self.degree + 1)
+
+            rows = np.arange(len(self))[:, None, None]
+            idx = span_indices(spans.ravel(), self.degree).reshape(basis.shape)
+            weighted = basis * self.weights[rows, idx]
+            points = np.einsum('bki,bkid->bkd', weighted, self.control_points[rows, idx])
+            return np.divide(points, weighted.sum(axis=2, keepdims=True), out=out)
+
+    def find_spans(self, ts: np.ndarray) -> np.ndarray:
+        # (B, k) spans, one searchsorted when every curve shares its knots
+        if np.all(self.knots == self.knots[:1]):
+            return find_spans(ts, self.knots[0], self.degree)
+        return batch_find_spans(ts, self.knots, self.degree)
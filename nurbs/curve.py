@@ -1,5 +1,12 @@
 import numpy as np
 from dataclasses import dataclass
+from math import comb
+from typing import Optional, Sequence, Tuple
+from nurbs.basis import (BasisCache, SparseBasis, find_spans, float_dtype, basis_derivatives,
+                         span_indices, split_at_breaks)
+from nurbs import backend, profiling
+from nurbs.refinement import bernstein, bezier_segments, refine_knots
+from nurbs.spatial import KDTree, backtracking_step, group_argmin
 
 
 @dataclass
@@ -11,7 +18,15 @@ class NURBSCurve:
 
     def __post_init__(self):
         self._validate_inputs()
-        self._cache: dict = {}
+        self._cache = BasisCache()
+        self._projection = None
+        self._bezier = None
+
+    def __setattr__(self, name, value):
+        # Drop cached bases as soon as the knot vector or degree is replaced
+        if name in ("knots", "degree") and "_cache" in self.__dict__:
+            self._cache.clear()
+        super().__setattr__(name, value)
 
     def _validate_inputs(self) -> None:
         if len(self.control_points) != len(self.weights):
@@ -19,11 +34,175 @@ class NURBSCurve:
         if len(self.knots) != len(self.control_points) + self.degree + 1:
             raise ValueError("Invalid knot vector length")
 
+    @property
+    def dtype(self) -> np.dtype:
+        # Evaluation dtype: float32 for float32 control points and weights, float64 otherwise
+        return float_dtype(self.control_points, self.weights)
+
     def evaluate(self, t: float) -> np.ndarray:
+        if backend.get_backend() == "numba":
+            return backend.curve_points(t, self.control_points, self.weights, self.knots, self.degree)[0]
         span = self.find_span(t)
         basis = self.basis_functions(span, t)
         return self.calculate_point(basis, span)
 
+    def evaluate_many(self, ts: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        # Points at ts -> (len(ts), dim) in self.dtype, written into out when given
+        ts = np.atleast_1d(np.asarray(ts, dtype=self.dtype))
+        with profiling.stage("curve.evaluate_many", len(ts)):
+            spans, basis = self._cache.lookup(ts, self.knots, self.degree)
+            return self.calculate_points(basis, spans, out)
+
+    def derivatives(self, ts: np.ndarray, order: int = 1) -> np.ndarray:
+        '''
+            Analytic derivatives C^(k)(t) for k = 0..order -> (order + 1, len(ts), dim).
+            Basis derivatives come from one recurrence pass, then the
+            rational quotient rule (Piegl & Tiller A4.2) is applied.
+        '''
+
+        ts = np.atleast_1d(np.asarray(ts, dtype=np.float64))
+        spans = find_spans(ts, self.knots, self.degree)
+        ders = basis_derivatives(ts, spans, self.knots, self.degree, order)
+        idx = span_indices(spans, self.degree)
+        weights = self.weights[idx]
+
+        A = np.einsum('kai,kid->akd', ders, self.control_points[idx] * weights[..., None])
+        W = np.einsum('kai,ki->ak', ders, weights)
+        C = np.zeros_like(A)
+        for k in range(order + 1):
+            v = A[k].copy()
+            for i in range(1, k + 1):
+                v -= comb(k, i) * W[i][:, None] * C[k - i]
+            C[k] = v / W[0][:, None]
+        return C
+
+    def tangents(self, ts: np.ndarray) -> np.ndarray:
+        velocity = self.derivatives(ts, order=1)[1]
+        return velocity / np.linalg.norm(velocity, axis=1, keepdims=True)
+
+    def curvature(self, ts: np.ndarray) -> np.ndarray:
+        # |C' x C''| / |C'|^3, written with dot products so it holds in any dimension
+        _, d1, d2 = self.derivatives(ts, order=2)
+        speed2 = np.sum(d1 * d1, axis=1)
+        cross2 = speed2 * np.sum(d2 * d2, axis=1) - np.sum(d1 * d2, axis=1) ** 2
+        return np.sqrt(np.maximum(cross2, 0.0)) / speed2 ** 1.5
+
+    def closest_points(self, points: np.ndarray, iterations: int = 10,
+                       tolerance: float = 1e-12) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        '''
+            Closest curve point to every row of points -> (ts, curve points, distances).
+            A KD-tree over a cached tessellation gives the seeds: the local
+            minima among samples within half a chord of the nearest one, so
+            the basin of the global minimum is always seeded. Damped vectorized Newton steps
+            on C'(t) . (C(t) - p) = 0 refine all seeds, each kept inside its
+            smooth piece so kinks behave like end points; the best one wins.
+        '''
+
+        points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        grid, tree = self._projection_tree()
+        start_dist, _ = tree.query(points)
+        queries, seeds = tree.query_radius(points, start_dist)
+        dist = np.linalg.norm(tree.points[seeds] - points[queries], axis=1)
+        pairs, low, high = split_at_breaks(grid[seeds], self.knots, self.degree)
+        queries, seeds, dist = queries[pairs], seeds[pairs], dist[pairs]
+
+        # One seed per basin: samples no farther than their neighbours in the same piece
+        for offset in (-1, 1):
+            neighbour = np.clip(seeds + offset, 0, len(grid) - 1)
+            outside = (grid[neighbour] < low) | (grid[neighbour] > high)
+            keep = outside | (dist <= np.linalg.norm(tree.points[neighbour] - points[queries], axis=1))
+            queries, seeds, dist, low, high = (a[keep] for a in (queries, seeds, dist, low, high))
+        targets = points[queries]
+        ts = np.clip(grid[seeds], low, high)
+
+        for _ in range(iterations):
+            C, d1, d2 = self.derivatives(ts, order=2)
+            r = C - targets
+            f = np.sum(d1 * r, axis=1)
+            speed2 = np.sum(d1 * d1, axis=1)
+            df = np.sum(d2 * r, axis=1) + speed2
+            # Gauss-Newton where the second derivative is not positive
+            df = np.where(df > 0, df, speed2)
+            step = np.divide(f, df, out=np.zeros_like(f), where=df > 0)
+            moved = backtracking_step(lambda t: self.derivatives(t, order=0)[0],
+                                      ts, step, dist, targets, low, high)
+            if np.all(moved < tolerance):
+                break
+
+        winners = group_argmin(queries, dist)
+        ts = ts[winners]
+        return ts, self.derivatives(ts, order=0)[0], dist[winners]
+
+    def _projection_tree(self, samples_per_span: int = 16) -> Tuple[np.ndarray, KDTree]:
+        '''
+            Tessellation and its KD-tree, rebuilt only when the geometry changed.
+            Each sample is padded by half its longest adjacent chord: the sample
+            nearest to any curve point is at most that much farther from a query.
+        '''
+
+        key = self._geometry_key()
+        if self._projection is None or self._projection[0] != key:
+            spans = len(self.control_points) - self.degree
+            grid = np.linspace(self.knots[self.degree], self.knots[-self.degree - 1],
+                               samples_per_span * spans + 1)
+            samples = self.derivatives(grid, order=0)[0]
+            chords = np.linalg.norm(np.diff(samples, axis=0), axis=1)
+            pad = np.maximum(np.append(chords, 0), np.insert(chords, 0, 0)) / 2
+            self._projection = (key, grid, KDTree(samples, pad=pad))
+        return self._projection[1:]
+
+    def insert_knot(self, t: float, times: int = 1) -> "NURBSCurve":
+        # Same curve with t inserted times more into the knot vector
+        return self.refine(np.full(times, t, dtype=np.float64))
+
+    def refine(self, new_knots: Sequence[float]) -> "NURBSCurve":
+        # Same curve with all new_knots inserted in one pass (Piegl & Tiller A5.4)
+        points, knots = refine_knots(self._homogeneous(), self.knots, self.degree, new_knots)
+        return NURBSCurve(points[:, :-1] / points[:, -1:], points[:, -1], knots, self.degree)
+
+    def bezier_segments(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Cached rational Bezier form -> (breaks (S + 1,), homogeneous points (S, degree + 1, dim + 1))
+        key = self._geometry_key()
+        if self._bezier is None or self._bezier[0] != key:
+            self._bezier = (key,) + bezier_segments(self._homogeneous(), self.knots, self.degree)
+        return self._bezier[1:]
+
+    def evaluate_bezier(self, ts: np.ndarray, segment: Optional[int] = None) -> np.ndarray:
+        '''
+            Evaluation through the cached Bezier form -> (len(ts), dim).
+            With segment given, all ts must lie in that piece and there is no
+            span lookup at all: each point is a fixed degree + 1 term
+            Bernstein sum over the same control points.
+        '''
+
+        ts = np.atleast_1d(np.asarray(ts, dtype=np.float64))
+        breaks, segments = self.bezier_segments()
+        if segment is None:
+            index = np.clip(np.searchsorted(breaks, ts, side='right') - 1, 0, len(segments) - 1)
+            local = (ts - breaks[index]) / (breaks[index + 1] - breaks[index])
+            points = np.einsum('ki,kid->kd', bernstein(local, self.degree), segments[index])
+        else:
+            local = (ts - breaks[segment]) / (breaks[segment + 1] - breaks[segment])
+            points = bernstein(local, self.degree) @ segments[segment]
+        return points[:, :-1] / points[:, -1:]
+
+    def _homogeneous(self) -> np.ndarray:
+        # (n, dim + 1) control points [w * P, w]
+        weights = self.weights[:, None]
+        return np.concatenate([self.control_points * weights, weights], axis=1)
+
+    def _geometry_key(self) -> tuple:
+        # Identifies the current geometry for caches that are not cleared on in-place edits
+        return (hash(self.control_points.tobytes()), hash(self.weights.tobytes()),
+                hash(np.asarray(self.knots).tobytes()), self.degree)
+
+    def sparse_basis(self, ts: np.ndarray) -> SparseBasis:
+        # Precomputed N(ts) for fixed knots/parameters, see SparseBasis.evaluate
+        return SparseBasis.from_knots(ts, self.knots, self.degree)
+
+    def cache_info(self) -> dict:
+        return self._cache.info()
+
     def find_span(self, t: float) -> int:
         '''
             Which interval contains t.
@@ -52,9 +231,9 @@ class NURBSCurve:
 
         knots = self.knots
         degree = self.degree
-        left = np.zeros(degree + 1)
-        right = np.zeros(degree + 1)
-        N = np.zeros(degree + 1)
+        left = np.zeros(degree + 1, dtype=self.dtype)
+        right = np.zeros(degree + 1, dtype=self.dtype)
+        N = np.zeros(degree + 1, dtype=self.dtype)
 
         N[0] = 1.0
         for j in range(1, degree + 1):
@@ -71,7 +250,7 @@ class NURBSCurve:
         return N
 
     def calculate_point(self, basis: np.ndarray, span: int) -> np.ndarray:
-        point = np.zeros(self.control_points.shape[1])
+        point = np.zeros(self.control_points.shape[1], dtype=self.dtype)
         weight = 0.0
 
         for i in range(self.degree + 1):
@@ -81,3 +260,8 @@ class NURBSCurve:
             weight += temp
 
         return point / weight
+
+    def calculate_points(self, basis: np.ndarray, spans: np.ndarray,
+                         out: Optional[np.ndarray] = None) -> np.ndarray:
+        # Batched calculate_point: basis (k, degree + 1), spans (k,) -> (k, dim)
+        return backend.contract_points(spans, basis, self.control_points, self.weights, self.degree, out)
@@ -0,0 +1,119 @@
+import numba
+import numpy as np
+
+# Compiled kernels of the "numba" backend, imported by nurbs.backend on first
+# use so that importing nurbs never pays for loading numba. Each kernel keeps
+# its scratch buffers for the whole call: no allocation per point.
+
+
+@numba.njit(cache=True, nogil=True)
+def _find_span(t, knots, degree, n):
+    # Same result as basis.find_spans: clamped to [degree, n], n = last control point
+    if t >= knots[n + 1]:
+        return n
+    if t < knots[degree + 1]:
+        return degree
+    low, high = degree, n + 1
+    while high - low > 1:
+        mid = (low + high) // 2
+        if t < knots[mid]:
+            high = mid
+        else:
+            low = mid
+    return low
+
+
+@numba.njit(cache=True, nogil=True)
+def _basis(t, span, knots, degree, N, left, right):
+    # Cox-de Boor into N[:degree + 1], left/right are caller-owned scratch
+    N[0] = 1.0
+    for j in range(1, degree + 1):
+        left[j] = t - knots[span + 1 - j]
+        right[j] = knots[span + j] - t
+        saved = 0.0
+        for r in range(j):
+            temp = N[r] / (right[r + 1] + left[j - r])
+            N[r] = saved + right[r + 1] * temp
+            saved = left[j - r] * temp
+        N[j] = saved
+
+
+@numba.njit(cache=True, nogil=True)
+def find_spans(ts, knots, degree, out):
+    n = len(knots) - degree - 2
+    for k in range(len(ts)):
+        out[k] = _find_span(ts[k], knots, degree, n)
+
+
+@numba.njit(cache=True, nogil=True)
+def basis_functions(ts, spans, knots, degree, out):
+    left = np.empty(degree + 1)
+    right = np.empty(degree + 1)
+    for k in range(len(ts)):
+        _basis(ts[k], spans[k], knots, degree, out[k], left, right)
+
+
+@numba.njit(cache=True, nogil=True)
+def curve_points(ts, control_points, weights, knots, degree, out):
+    n = len(knots) - degree - 2
+    N = np.empty(degree + 1)
+    left = np.empty(degree + 1)
+    right = np.empty(degree + 1)
+    for k in range(len(ts)):
+        span = _find_span(ts[k], knots, degree, n)
+        _basis(ts[k], span, knots, degree, N, left, right)
+        out[k] = 0.0
+        total = 0.0
+        for i in range(degree + 1):
+            index = span - degree + i
+            w = N[i] * weights[index]
+            total += w
+            for d in range(out.shape[1]):
+                out[k, d] += w * control_points[index, d]
+        for d in range(out.shape[1]):
+            out[k, d] /= total
+
+
+@numba.njit(cache=True, nogil=True)
+def surface_points(us, vs, control_points, weights, knots_u, knots_v,
+                   degree_u, degree_v, out):
+    n_u = len(knots_u) - degree_u - 2
+    n_v = len(knots_v) - degree_v - 2
+    width = max(degree_u, degree_v) + 1
+    Nu = np.empty(degree_u + 1)
+    Nv = np.empty(degree_v + 1)
+    left = np.empty(width)
+    right = np.empty(width)
+    for k in range(len(us)):
+        span_u = _find_span(us[k], knots_u, degree_u, n_u)
+        span_v = _find_span(vs[k], knots_v, degree_v, n_v)
+        _basis(us[k], span_u, knots_u, degree_u, Nu, left, right)
+        _basis(vs[k], span_v, knots_v, degree_v, Nv, left, right)
+        out[k] = 0.0
+        total = 0.0
+        for i in range(degree_u + 1):
+            row = span_u - degree_u + i
+            for j in range(degree_v + 1):
+                col = span_v - degree_v + j
+                w = Nu[i] * Nv[j] * weights[row, col]
+                total += w
+                for d in range(out.shape[1]):
+                    out[k, d] += w * control_points[row, col, d]
+        for d in range(out.shape[1]):
+            out[k, d] /= total
+
+
+@numba.njit(cache=True, nogil=True)
+def contract_points(spans, basis, control_points, weights, degree, out):
+    # Weighted contraction of precomputed (spans, basis), as in curve_points
+    for k in range(len(spans)):
+        out[k] = 0.0
+        total = 0.0
+        for i in range(degree + 1):
+            index = spans[k] - degree + i
+            w = basis[k, i] * weights[index]
+            total += w
+            for d in range(out.shape[1]):
+                out[k, d] += w * control_points[index, d]
+        for d in range(out.shape[1]):
+            out[k, d] /= total
@@ -0,0 +1,83 @@
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from nurbs import backend
+from nurbs.basis import output_buffer
+from nurbs.batch import NURBSCurveBatch
+from nurbs.curve import NURBSCurve
+from nurbs.surface import NURBSSurface
+
+# Parameters per task: large enough to amortize dispatch, small enough to stay in cache
+DEFAULT_CHUNK_SIZE = 1 << 14
+
+
+def map_chunks(function: Callable[[slice, np.ndarray], object], length: int, out: np.ndarray,
+               workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    '''
+        Fill out[0:length] chunk by chunk in a thread pool: function(chunk,
+        out[chunk]) writes the results of chunk into that view, so there
+        are no per-chunk copies. Threads only pay off because the work
+        inside function runs without the GIL: NumPy's large array operations
+        and the nogil kernels of the numba backend. Chunks are disjoint, so
+        workers never write to the same memory.
+    '''
+
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+    chunks = [slice(start, min(start + chunk_size, length)) for start in range(0, length, chunk_size)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+
+    def task(chunk: slice) -> None:
+        function(chunk, out[chunk])
+
+    if workers <= 1:
+        for chunk in chunks:
+            task(chunk)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # list() re-raises the first exception of a worker
+            list(pool.map(task, chunks))
+    return out
+
+
+def evaluate_curve(curve: NURBSCurve, ts: np.ndarray, out: Optional[np.ndarray] = None,
+                   workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    # curve.evaluate_many(ts) split over threads -> (len(ts), dim)
+    ts = np.atleast_1d(np.asarray(ts, dtype=curve.dtype))
+    out = output_buffer((len(ts), curve.control_points.shape[1]), curve.dtype, out)
+    # Straight to the stateless backend: the curve's basis cache is not thread-safe
+    return map_chunks(lambda chunk, view: backend.curve_points(
+        ts[chunk], curve.control_points, curve.weights, curve.knots, curve.degree, view),
+        len(ts), out, workers, chunk_size)
+
+
+def evaluate_batch(batch: NURBSCurveBatch, ts: np.ndarray, out: Optional[np.ndarray] = None,
+                   workers: Optional[int] = None, chunk_size: int = 64) -> np.ndarray:
+    # batch.evaluate_many(ts) split into chunks of chunk_size curves -> (B, k, dim)
+    dtype = batch.control_points.dtype
+    ts = np.broadcast_to(np.asarray(ts, dtype=dtype), (len(batch), np.shape(ts)[-1]))
+    out = output_buffer((len(batch), ts.shape[1], batch.control_points.shape[2]), dtype, out)
+    return map_chunks(lambda chunk, view: batch[chunk].evaluate_many(ts[chunk], view),
+                      len(batch), out, workers, chunk_size)
+
+
+def evaluate_surface_points(surface: NURBSSurface, uv_pairs: np.ndarray, out: Optional[np.ndarray] = None,
+                            workers: Optional[int] = None,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    # surface.evaluate_points(uv_pairs) split over threads -> (k, dim)
+    uv_pairs = np.atleast_2d(np.asarray(uv_pairs, dtype=surface.dtype))
+    out = output_buffer((len(uv_pairs), surface.control_points.shape[2]), surface.dtype, out)
+    return map_chunks(lambda chunk, view: surface.evaluate_points(uv_pairs[chunk], view),
+                      len(uv_pairs), out, workers, chunk_size)
+
+
+def evaluate_surface_grid(surface: NURBSSurface, us: np.ndarray, vs: np.ndarray,
+                          out: Optional[np.ndarray] = None, workers: Optional[int] = None,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    # surface.evaluate_grid(us, vs) in bands of us rows holding about chunk_size points
+    us, vs = np.atleast_1d(np.asarray(us, dtype=surface.dtype)), np.atleast_1d(np.asarray(vs, dtype=surface.dtype))
+    out = output_buffer((len(us), len(vs), surface.control_points.shape[2]), surface.dtype, out)
+    return map_chunks(lambda chunk, view: surface.evaluate_grid(us[chunk], vs, view),
+                      len(us), out, workers, max(1, chunk_size // max(len(vs), 1)))
+
@@ -0,0 +1,126 @@
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, Optional
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    seconds: float = 0.0  # wall time, nested stages included
+    points: int = 0       # points evaluated, fitted or generated
+    bytes: int = 0        # sum over calls of the traced peak above the start of the call
+
+
+@dataclass
+class Profile:
+    '''
+        Per-stage statistics collected inside profile(). Stages nest, eg.
+        fitter.solve runs inside fitter.interpolate, and the time and bytes
+        of a stage include those of the stages it calls.
+    '''
+
+    memory: bool = False
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, points: int, allocated: int) -> None:
+        with self._lock:
+            stats = self.stages.setdefault(name, StageStats())
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.points += points
+            stats.bytes += allocated
+
+    def as_dict(self) -> dict:
+        stages = {name: asdict(stats) for name, stats in sorted(self.stages.items())}
+        return {"memory": self.memory, "stages": stages}
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+    def table(self) -> str:
+        lines = [f"{'stage':40s} {'calls':>8s} {'seconds':>10s} {'pts/s':>14s} {'MiB':>9s}"]
+        for name, stats in sorted(self.stages.items()):
+            rate = f"{stats.points / stats.seconds:14.0f}" if stats.points and stats.seconds > 0 else f"{'-':>14s}"
+            memory = f"{stats.bytes / 2**20:9.2f}" if self.memory else f"{'-':>9s}"
+            lines.append(f"{name:40s} {stats.calls:8d} {stats.seconds:10.4f} {rate} {memory}")
+        return "\n".join(lines)
+
+
+# The profile being collected, None when instrumentation is off
+_profile: Optional[Profile] = None
+_disabled = nullcontext()
+_local = threading.local()
+
+
+@contextmanager
+def profile(memory: bool = False) -> Iterator[Profile]:
+    '''
+        Collects stage statistics of everything run inside the block.
+        memory=True also traces allocations (tracemalloc), which slows
+        NumPy-heavy code down noticeably; the byte counts are only exact
+        when stages do not run concurrently in threads.
+    '''
+
+    global _profile
+    if _profile is not None:
+        raise RuntimeError("A profile is already being collected")
+    _profile = Profile(memory)
+    tracing = memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    try:
+        yield _profile
+    finally:
+        if tracing:
+            tracemalloc.stop()
+        _profile = None
+
+
+def stage(name: str, points: int = 0):
+    '''
+        with stage("curve.evaluate_many", len(ts)): ...
+        Returns a shared no-op context when no profile is collected, so the
+        only cost of an instrumented call is one function call.
+    '''
+
+    if _profile is None:
+        return _disabled
+    return _Stage(_profile, name, points)
+
+
+class _Stage:
+    def __init__(self, profile: Profile, name: str, points: int):
+        self.profile = profile
+        self.name = name
+        self.points = int(points)
+
+    def __enter__(self) -> None:
+        if self.profile.memory:
+            # Fold the peak so far into the enclosing stage before resetting it
+            stack = _local.__dict__.setdefault("stack", [])
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            stack.append([current, current])
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        seconds = time.perf_counter() - self.start
+        allocated = 0
+        if self.profile.memory:
+            stack = _local.stack
+            start, peak = stack.pop()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            allocated = peak - start
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+        self.profile.record(self.name, seconds, self.points, allocated)
@@ -0,0 +1,90 @@
+import numpy as np
+from math import comb
+from typing import Tuple
+from nurbs.basis import find_spans
+
+
+def refine_knots(points: np.ndarray, knots: np.ndarray, degree: int,
+                 new_knots: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+        Insert all new_knots at once (Piegl & Tiller A5.4) -> (points, knots).
+        points are homogeneous and refined along axis 0, so trailing axes
+        (dimension, or the other direction of a surface net) ride along.
+    '''
+
+    knots = np.asarray(knots, dtype=np.float64)
+    X = np.sort(np.asarray(new_knots, dtype=np.float64).ravel())
+    if len(X) == 0:
+        return points.copy(), knots.copy()
+    _check_new_knots(knots, degree, X)
+
+    p, n, m, r = degree, len(points) - 1, len(knots) - 1, len(X) - 1
+    a = int(find_spans(X[:1], knots, p)[0])
+    b = int(find_spans(X[-1:], knots, p)[0]) + 1
+    Q = np.empty((n + r + 2,) + points.shape[1:])
+    U = np.empty(m + r + 2)
+    Q[:a - p + 1] = points[:a - p + 1]
+    Q[b + r:] = points[b - 1:]
+    U[:a + 1] = knots[:a + 1]
+    U[b + p + r + 1:] = knots[b + p:]
+
+    i, k = b + p - 1, b + p + r
+    for x in X[::-1]:
+        while x <= knots[i] and i > a:
+            Q[k - p - 1] = points[i - p - 1]
+            U[k] = knots[i]
+            k, i = k - 1, i - 1
+        Q[k - p - 1] = Q[k - p]
+        for l in range(1, p + 1):
+            ind = k - p + l
+            alpha = U[k + l] - x
+            if alpha == 0.0:
+                Q[ind - 1] = Q[ind]
+            else:
+                alpha /= U[k + l] - knots[i - p + l]
+                Q[ind - 1] = alpha * Q[ind - 1] + (1.0 - alpha) * Q[ind]
+        U[k] = x
+        k -= 1
+    return Q, U
+
+
+def insert_knot(points: np.ndarray, knots: np.ndarray, degree: int,
+                t: float, times: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    return refine_knots(points, knots, degree, np.full(times, t, dtype=np.float64))
+
+
+def bezier_segments(points: np.ndarray, knots: np.ndarray,
+                    degree: int) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+        Decomposition into Bezier pieces -> (breaks (S + 1,), segments (S, degree + 1, ...)).
+        Every interior knot is raised to multiplicity degree, after which
+        the control points of each knot span are its Bezier control points.
+    '''
+
+    knots = np.asarray(knots, dtype=np.float64)
+    inner = knots[degree + 1:len(knots) - degree - 1]
+    values, counts = np.unique(inner, return_counts=True)
+    points, knots = refine_knots(points, knots, degree,
+                                 np.repeat(values, np.maximum(degree - counts, 0)))
+
+    spans = np.flatnonzero(np.diff(knots))
+    spans = spans[(spans >= degree) & (spans < len(points))]
+    breaks = np.append(knots[spans], knots[spans[-1] + 1])
+    return breaks, points[spans[:, None] - degree + np.arange(degree + 1)]
+
+
+def bernstein(s: np.ndarray, degree: int) -> np.ndarray:
+    # Bernstein polynomials B_i,degree(s) on [0, 1] -> (len(s), degree + 1)
+    s = np.asarray(s, dtype=np.float64)[:, None]
+    i = np.arange(degree + 1)
+    coefficients = np.array([comb(degree, j) for j in i], dtype=np.float64)
+    return coefficients * s ** i * (1.0 - s) ** (degree - i)
+
+
+def _check_new_knots(knots: np.ndarray, degree: int, new_knots: np.ndarray) -> None:
+    if new_knots[0] <= knots[degree] or new_knots[-1] >= knots[-degree - 1]:
+        raise ValueError("Inserted knots must lie strictly inside the domain")
+    values, counts = np.unique(np.concatenate([knots, new_knots]), return_counts=True)
+    inside = (values > knots[degree]) & (values < knots[-degree - 1])
+    if np.any(counts[inside] > degree):
+        raise ValueError("Knot multiplicity would exceed the degree")
@@ -0,0 +1,121 @@
+import numpy as np
+from typing import Optional
+from nurbs.basis import SparseBasis
+from nurbs.curve import NURBSCurve
+from nurbs.surface import NURBSSurface
+
+
+class CurveSamples:
+    '''
+        Points of a curve at fixed parameters, kept up to date under edits.
+        Control point i only enters the degree + 1 knot spans after knot i,
+        so move() re-evaluates just the samples whose basis row holds a
+        nonzero N_i and returns their indices: the cost follows the size of
+        the edit, not the number of samples.
+    '''
+
+    def __init__(self, curve: NURBSCurve, ts: np.ndarray):
+        self.curve = curve
+        self.ts = np.atleast_1d(np.asarray(ts, dtype=np.float64))
+        self.basis = curve.sparse_basis(self.ts)
+        self._support = _Support(self.basis, curve.degree)
+        self.points = self.basis.evaluate(curve.control_points, curve.weights)
+
+    def move(self, indices: np.ndarray, control_points: Optional[np.ndarray] = None,
+             weights: Optional[np.ndarray] = None) -> np.ndarray:
+        '''
+            Set the control points and/or weights at indices (the curve is
+            edited in place) -> sorted indices of the samples that changed.
+        '''
+
+        indices = np.atleast_1d(np.asarray(indices, dtype=np.intp))
+        if control_points is not None:
+            self.curve.control_points[indices] = control_points
+        if weights is not None:
+            self.curve.weights[indices] = weights
+
+        changed = self._support.samples(indices)
+        rows = self.basis.indices[changed]
+        weighted = self.basis.values[changed] * self.curve.weights[rows]
+        points = np.einsum('ki,kid->kd', weighted, self.curve.control_points[rows])
+        self.points[changed] = points / weighted.sum(axis=1, keepdims=True)
+        return changed
+
+
+class SurfaceSamples:
+    '''
+        Points of a surface on the fixed grid us x vs, kept up to date under
+        edits like CurveSamples. Control point (i, j) only moves the grid
+        rows that depend on i times the columns that depend on j.
+    '''
+
+    def __init__(self, surface: NURBSSurface, us: np.ndarray, vs: np.ndarray):
+        self.surface = surface
+        self.us = np.atleast_1d(np.asarray(us, dtype=np.float64))
+        self.vs = np.atleast_1d(np.asarray(vs, dtype=np.float64))
+        self.basis_u = SparseBasis.from_knots(self.us, surface.knots_u, surface.degree_u)
+        self.basis_v = SparseBasis.from_knots(self.vs, surface.knots_v, surface.degree_v)
+        self._support_u = _Support(self.basis_u, surface.degree_u)
+        self._support_v = _Support(self.basis_v, surface.degree_v)
+        self.points = surface.evaluate_grid(self.us, self.vs)
+
+    def move(self, indices: np.ndarray, control_points: Optional[np.ndarray] = None,
+             weights: Optional[np.ndarray] = None) -> np.ndarray:
+        '''
+            Set the control points and/or weights at the (k, 2) control net
+            indices (the surface is edited in place) -> (changed, 2) sorted
+            (row, column) grid indices of the samples that changed.
+        '''
+
+        indices = np.atleast_2d(np.asarray(indices, dtype=np.intp))
+        net = (indices[:, 0], indices[:, 1])
+        if control_points is not None:
+            self.surface.control_points[net] = control_points
+        if weights is not None:
+            self.surface.weights[net] = weights
+
+        # Each edit moves a rows x columns block, re-evaluated as a small tensor product
+        changed = []
+        for i, j in indices:
+            rows, cols = self._support_u.samples(i), self._support_v.samples(j)
+            basis_u, span_u = _local_dense(self.basis_u, rows)
+            basis_v, span_v = _local_dense(self.basis_v, cols)
+            local = self.surface.weights[span_u, span_v, None]
+            net = np.concatenate([self.surface.control_points[span_u, span_v] * local, local], axis=-1)
+            block = np.einsum('ai,bj,ijd->abd', basis_u, basis_v, net, optimize=True)
+            self.points[np.ix_(rows, cols)] = block[..., :-1] / block[..., -1:]
+            changed.append((rows[:, None] * len(self.vs) + cols).ravel())
+        rows, cols = np.divmod(np.unique(np.concatenate(changed)), len(self.vs))
+        return np.stack([rows, cols], axis=1)
+
+
+def _local_dense(basis: SparseBasis, samples: np.ndarray):
+    # Dense basis rows of samples over the control points they touch -> (rows, slice)
+    indices = basis.indices[samples]
+    low, high = (indices[:, 0].min(), indices[:, -1].max() + 1) if len(samples) else (0, 0)
+    dense = np.zeros((len(samples), high - low))
+    np.put_along_axis(dense, indices - low, basis.values[samples], axis=1)
+    return dense, slice(low, high)
+
+
+class _Support:
+    # Which samples of a SparseBasis have a nonzero basis value for given control indices
+
+    def __init__(self, basis: SparseBasis, degree: int):
+        self.basis = basis
+        self.degree = degree
+        first = basis.indices[:, 0]
+        self.order = np.argsort(first, kind='stable')
+        self.first = first[self.order]
+
+    def samples(self, controls: np.ndarray) -> np.ndarray:
+        controls = np.unique(np.atleast_1d(controls))
+        # Sample k holds controls first[k] .. first[k] + degree
+        low = np.searchsorted(self.first, controls - self.degree, side='left')
+        high = np.searchsorted(self.first, controls, side='right')
+        lengths = high - low
+        candidates = self.order[np.repeat(low - np.cumsum(lengths) + lengths, lengths)
+                                + np.arange(lengths.sum())]
+        candidates = np.unique(candidates)
+        hit = np.isin(self.basis.indices[candidates], controls) & (self.basis.values[candidates] != 0)
+        return candidates[hit.any(axis=1)]
@@ -0,0 +1,156 @@
+import numpy as np
+from typing import Callable, Optional, Tuple
+
+
+class KDTree:
+    '''
+        Implicit (heap-ordered) KD-tree with vectorized batched queries.
+        Points are padded to full leaves by repeating point 0, so every
+        level splits evenly and the tree needs no per-node Python objects.
+        A query first descends greedily to a leaf for an upper bound, then
+        a breadth-first branch-and-bound visits only boxes closer than it.
+    '''
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 16,
+                 pad: Optional[np.ndarray] = None):
+        # pad: optional per-point radius added to query_radius, eg. local sample spacing
+        self.points = np.asarray(points, dtype=np.float64)
+        self.pad = np.zeros(len(self.points)) if pad is None else np.asarray(pad, dtype=np.float64)
+        n = len(self.points)
+        self.depth = max(0, int(np.ceil(np.log2(max(n / leaf_size, 1)))))
+        self.leaf_size = int(np.ceil(n / 2 ** self.depth))
+
+        # Slots past n are padding, they reuse point 0 so boxes stay tight
+        slots = np.arange(2 ** self.depth * self.leaf_size)
+        self.split_axis = np.zeros(2 ** self.depth - 1, dtype=np.intp)
+        self.split_value = np.zeros(2 ** self.depth - 1)
+
+        for level in range(self.depth):
+            segments = slots.reshape(2 ** level, -1)
+            coords = self.points[np.where(segments < n, segments, 0)]  # (nodes, seg, dim)
+            axis = np.argmax(np.ptp(coords, axis=1), axis=1)            # widest spread per node
+            keys = np.take_along_axis(coords, axis[:, None, None], axis=2)[..., 0]
+            order = np.argsort(keys, axis=1, kind='stable')
+            segments = np.take_along_axis(segments, order, axis=1)
+            slots = segments.ravel()
+
+            nodes = np.arange(2 ** level) + 2 ** level - 1
+            self.split_axis[nodes] = axis
+            self.split_value[nodes] = np.take_along_axis(keys, order, axis=1)[:, segments.shape[1] // 2]
+
+        self.order = np.where(slots < n, slots, 0)
+        self.padding = slots >= n
+        # Bounding boxes of every node, level by level -> lists of (nodes, dim)
+        ordered = self.points[self.order]
+        self.box_min = [ordered.reshape(2 ** l, -1, ordered.shape[1]).min(axis=1)
+                        for l in range(self.depth + 1)]
+        self.box_max = [ordered.reshape(2 ** l, -1, ordered.shape[1]).max(axis=1)
+                        for l in range(self.depth + 1)]
+        self.box_pad = [self.pad[self.order].reshape(2 ** l, -1).max(axis=1)
+                        for l in range(self.depth + 1)]
+
+    def query(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Nearest tree point of every row of x -> (distances, indices into points)
+        x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+        leaf = np.zeros(len(x), dtype=np.intp)
+        for level in range(self.depth):
+            node = leaf + 2 ** level - 1
+            go_right = x[np.arange(len(x)), self.split_axis[node]] >= self.split_value[node]
+            leaf = 2 * leaf + go_right
+        best, best_idx = self._scan_leaves(x, np.arange(len(x)), leaf)
+
+        queries, leaves = self._candidate_leaves(x, best.copy(), tighten=True)
+        dist, idx = self._scan_leaves(x, queries, leaves)
+        winners = group_argmin(queries, dist)
+        improved = dist[winners] < best[queries[winners]]
+        best[queries[winners][improved]] = dist[winners][improved]
+        best_idx[queries[winners][improved]] = idx[winners][improved]
+        return np.sqrt(best), best_idx
+
+    def query_radius(self, x: np.ndarray, radius: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Every (query row, point index) pair closer than radius (scalar or per query) + pad
+        x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+        radius = np.broadcast_to(np.asarray(radius, dtype=np.float64), len(x))
+        queries, leaves = self._candidate_leaves(x, np.nextafter(radius, np.inf), padded=True)
+
+        members = self.order.reshape(-1, self.leaf_size)[leaves]
+        dist = np.linalg.norm(self.points[members] - x[queries][:, None], axis=2)
+        padding = self.padding.reshape(-1, self.leaf_size)[leaves]
+        rows, cols = np.nonzero((dist <= radius[queries][:, None] + self.pad[members]) & ~padding)
+        return queries[rows], members[rows, cols]
+
+    def _candidate_leaves(self, x: np.ndarray, bound: np.ndarray, tighten: bool = False,
+                          padded: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        '''
+            Breadth-first branch-and-bound: (query, leaf) pairs whose box is
+            within the squared distance bound. With tighten, the bound shrinks
+            to the farthest-corner distance of visited boxes, as every box
+            holds at least one point. With padded, bound is a plain radius
+            widened by the largest point pad of each box.
+        '''
+
+        queries, nodes = np.arange(len(x)), np.zeros(len(x), dtype=np.intp)
+        for level in range(self.depth + 1):
+            low, high = self.box_min[level][nodes], self.box_max[level][nodes]
+            offsets = x[queries]
+            if tighten:
+                far = np.maximum(np.abs(offsets - low), np.abs(offsets - high))
+                np.minimum.at(bound, queries, np.sum(far ** 2, axis=1))
+            near = np.sum((offsets - np.clip(offsets, low, high)) ** 2, axis=1)
+            if padded:
+                keep = near <= (bound[queries] + self.box_pad[level][nodes]) ** 2
+            else:
+                keep = near <= bound[queries] if tighten else near < bound[queries]
+            queries, nodes = queries[keep], nodes[keep]
+            if level < self.depth:
+                queries = np.repeat(queries, 2)
+                nodes = (2 * nodes[:, None] + np.arange(2)).ravel()
+        return queries, nodes
+
+    def _scan_leaves(self, x: np.ndarray, queries: np.ndarray,
+                     leaves: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Squared distance and index of the nearest point in each (query, leaf) pair
+        members = self.order.reshape(-1, self.leaf_size)[leaves]        # (pairs, leaf_size)
+        d2 = np.sum((self.points[members] - x[queries][:, None]) ** 2, axis=2)
+        nearest = np.argmin(d2, axis=1) if len(d2) else np.zeros(0, dtype=np.intp)
+        rows = np.arange(len(members))
+        return d2[rows, nearest], members[rows, nearest]
+
+
+def group_argmin(groups: np.ndarray, values: np.ndarray) -> np.ndarray:
+    # Position of the smallest value within each group label
+    order = np.lexsort((values, groups))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = groups[order][1:] != groups[order][:-1]
+    return order[first]
+
+
+def backtracking_step(evaluate: Callable[[np.ndarray], np.ndarray], params: np.ndarray,
+                      step: np.ndarray, dist: np.ndarray, targets: np.ndarray,
+                      low, high, halvings: int = 6) -> np.ndarray:
+    '''
+        Damped projection update: params - step (clipped to [low, high]) is
+        accepted only where it brings evaluate(params) closer to targets,
+        halving the step otherwise.
+        params/dist are updated in place, returns the length of the accepted steps.
+    '''
+
+    pending = np.ones(len(params), dtype=bool)
+    moved = np.zeros(len(params))
+    step = step.copy()
+    low, high = np.broadcast_to(low, params.shape), np.broadcast_to(high, params.shape)
+    for _ in range(halvings):
+        rows = np.flatnonzero(pending)
+        trial = np.clip(params[rows] - step[rows], low[rows], high[rows])
+        trial_dist = np.linalg.norm(evaluate(trial) - targets[rows], axis=1)
+        better = trial_dist < dist[rows]
+        accepted = rows[better]
+        delta = np.abs(params[accepted] - trial[better])
+        moved[accepted] = delta if delta.ndim == 1 else delta.max(axis=1)
+        params[accepted] = trial[better]
+        dist[accepted] = trial_dist[better]
+        pending[accepted] = False
+        if not pending.any():
+            break
+        step[pending] *= 0.5
+    return moved
@@ -1,5 +1,15 @@
 import numpy as np
 from dataclasses import dataclass
+from math import comb
+from typing import Literal, Optional, Sequence, Tuple
+from nurbs.basis import (find_spans, float_dtype, basis_functions, basis_derivatives, basis_matrix,
+                         span_indices, split_at_breaks)
+from nurbs import backend, profiling
+from nurbs.refinement import bernstein, bezier_segments, refine_knots
+from nurbs.spatial import KDTree, backtracking_step, group_argmin
+
+
+Direction = Literal["u", "v"]
 
 
 @dataclass
@@ -11,15 +21,251 @@ class NURBSSurface:
     degree_u: int
     degree_v: int
 
+    def __post_init__(self):
+        self._projection = None
+        self._bezier = None
+
+    @property
+    def dtype(self) -> np.dtype:
+        # Evaluation dtype: float32 for float32 control points and weights, float64 otherwise
+        return float_dtype(self.control_points, self.weights)
+
     def evaluate(self, u: float, v: float) -> np.ndarray:
+        if backend.get_backend() == "numba":
+            return self.evaluate_points([[u, v]])[0]
         span_u = self._find_span(u, self.knots_u, self.degree_u)
         span_v = self._find_span(v, self.knots_v, self.degree_v)
 
-        basis_u = self._basis_functions(u, span_u, self.knots_u, self.degree_u)
-        basis_v = self._basis_functions(v, span_v, self.knots_v, self.degree_v)
+        basis_u = self._basis_functions(u, span_u, self.knots_u, self.degree_u, self.dtype)
+        basis_v = self._basis_functions(v, span_v, self.knots_v, self.degree_v, self.dtype)
 
         return self._compute_surface_point(basis_u, basis_v, span_u, span_v)
 
+    def evaluate_grid(self, us: np.ndarray, vs: np.ndarray,
+                      out: Optional[np.ndarray] = None) -> np.ndarray:
+        # Tensor-product evaluation on us x vs -> (len(us), len(vs), dim) in self.dtype, or into out
+        with profiling.stage("surface.evaluate_grid", np.size(us) * np.size(vs)):
+            basis_u = basis_matrix(np.asarray(us, dtype=self.dtype), self.knots_u, self.degree_u)
+            basis_v = basis_matrix(np.asarray(vs, dtype=self.dtype), self.knots_v, self.degree_v)
+            grid = np.einsum('ai,bj,ijd->abd', basis_u, basis_v,
+                             self._homogeneous_net(), optimize=True)
+            return np.divide(grid[..., :-1], grid[..., -1:], out=out)
+
+    def evaluate_points(self, uv_pairs: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        # Scattered evaluation of (k, 2) parameter pairs -> (k, dim) in self.dtype, or into out
+        uv_pairs = np.atleast_2d(np.asarray(uv_pairs, dtype=self.dtype))
+        us, vs = uv_pairs[:, 0], uv_pairs[:, 1]
+        with profiling.stage("surface.evaluate_points", len(uv_pairs)):
+            if backend.get_backend() == "numba":
+                return backend.surface_points(us, vs, self.control_points, self.weights, self.knots_u,
+                                              self.knots_v, self.degree_u, self.degree_v, out)
+            span_u = find_spans(us, self.knots_u, self.degree_u)
+            span_v = find_spans(vs, self.knots_v, self.degree_v)
+            basis_u = basis_functions(us, span_u, self.knots_u, self.degree_u)
+            basis_v = basis_functions(vs, span_v, self.knots_v, self.degree_v)
+
+            idx_u = span_indices(span_u, self.degree_u)[:, :, None]
+            idx_v = span_indices(span_v, self.degree_v)[:, None, :]
+            points = np.einsum('ki,kj,kijd->kd', basis_u, basis_v,
+                               self._homogeneous_net()[idx_u, idx_v])
+            return np.divide(points[:, :-1], points[:, -1:], out=out)
+
+    def derivatives(self, uv_pairs: np.ndarray, order: int = 1) -> np.ndarray:
+        '''
+            Partial derivatives S[a, b] = d^(a+b) S / du^a dv^b for a + b <= order
+            -> (order + 1, order + 1, k, dim), entries with a + b > order are zero.
+            Rational quotient rule from Piegl & Tiller A4.4.
+        '''
+
+        uv_pairs = np.atleast_2d(np.asarray(uv_pairs, dtype=np.float64))
+        us, vs = uv_pairs[:, 0], uv_pairs[:, 1]
+        span_u = find_spans(us, self.knots_u, self.degree_u)
+        span_v = find_spans(vs, self.knots_v, self.degree_v)
+        ders_u = basis_derivatives(us, span_u, self.knots_u, self.degree_u, order)
+        ders_v = basis_derivatives(vs, span_v, self.knots_v, self.degree_v, order)
+
+        idx_u = span_indices(span_u, self.degree_u)[:, :, None]
+        idx_v = span_indices(span_v, self.degree_v)[:, None, :]
+        homogeneous = np.einsum('kai,kbj,kijd->abkd', ders_u, ders_v,
+                                self._homogeneous_net()[idx_u, idx_v], optimize=True)
+        A, W = homogeneous[..., :-1], homogeneous[..., -1:]
+
+        S = np.zeros_like(A)
+        for a in range(order + 1):
+            for b in range(order - a + 1):
+                v = A[a, b].copy()
+                for j in range(1, b + 1):
+                    v -= comb(b, j) * W[0, j] * S[a, b - j]
+                for i in range(1, a + 1):
+                    v -= comb(a, i) * W[i, 0] * S[a - i, b]
+                    for j in range(1, b + 1):
+                        v -= comb(a, i) * comb(b, j) * W[i, j] * S[a - i, b - j]
+                S[a, b] = v / W[0, 0]
+        return S
+
+    def normals(self, uv_pairs: np.ndarray) -> np.ndarray:
+        # Unit normals S_u x S_v of a 3D surface -> (k, 3)
+        S = self.derivatives(uv_pairs, order=1)
+        normal = np.cross(S[1, 0], S[0, 1])
+        return normal / np.linalg.norm(normal, axis=1, keepdims=True)
+
+    def closest_points(self, points: np.ndarray, iterations: int = 10,
+                       tolerance: float = 1e-12) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        '''
+            Closest surface point to every row of points -> (uv, surface points, distances).
+            Seeds are the local minima among grid samples within half a cell
+            diagonal of the nearest distance (KD-tree over a cached
+            tessellation), refined by damped vectorized 2D Newton steps on
+            S_u . r = S_v . r = 0, each kept inside its smooth patch so
+            creases behave like edges; the best one wins.
+        '''
+
+        points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        grid, tree, shape = self._projection_tree()
+        start_dist, _ = tree.query(points)
+        queries, seeds = tree.query_radius(points, start_dist)
+        dist = np.linalg.norm(tree.points[seeds] - points[queries], axis=1)
+        pairs, low_u, high_u = split_at_breaks(grid[seeds, 0], self.knots_u, self.degree_u)
+        queries, seeds, dist = queries[pairs], seeds[pairs], dist[pairs]
+        pairs, low_v, high_v = split_at_breaks(grid[seeds, 1], self.knots_v, self.degree_v)
+        queries, seeds, dist = queries[pairs], seeds[pairs], dist[pairs]
+        low = np.stack([low_u[pairs], low_v], axis=1)
+        high = np.stack([high_u[pairs], high_v], axis=1)
+
+        # One seed per basin: grid samples no farther than their 4 neighbours in the same patch
+        for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            rows, cols = np.unravel_index(seeds, shape)
+            neighbour = np.ravel_multi_index((np.clip(rows + dr, 0, shape[0] - 1),
+                                              np.clip(cols + dc, 0, shape[1] - 1)), shape)
+            outside = np.any((grid[neighbour] < low) | (grid[neighbour] > high), axis=1)
+            keep = outside | (dist <= np.linalg.norm(tree.points[neighbour] - points[queries], axis=1))
+            queries, seeds, dist, low, high = (a[keep] for a in (queries, seeds, dist, low, high))
+        targets = points[queries]
+        uv = np.clip(grid[seeds], low, high)
+
+        for _ in range(iterations):
+            S = self.derivatives(uv, order=2)
+            r = S[0, 0] - targets
+            Su, Sv = S[1, 0], S[0, 1]
+            f = np.sum(Su * r, axis=1)
+            g = np.sum(Sv * r, axis=1)
+            G11, G12, G22 = np.sum(Su * Su, axis=1), np.sum(Su * Sv, axis=1), np.sum(Sv * Sv, axis=1)
+            H11 = G11 + np.sum(r * S[2, 0], axis=1)
+            H12 = G12 + np.sum(r * S[1, 1], axis=1)
+            H22 = G22 + np.sum(r * S[0, 2], axis=1)
+            # Gauss-Newton where the Hessian is not positive definite
+            indefinite = (H11 <= 0) | (H11 * H22 - H12 ** 2 <= 0)
+            J11, J12, J22 = (np.where(indefinite, G, H) for G, H in ((G11, H11), (G12, H12), (G22, H22)))
+
+            det = J11 * J22 - J12 ** 2
+            valid = det > 1e-300
+            step = np.zeros_like(uv)
+            step[valid, 0] = (f * J22 - g * J12)[valid] / det[valid]
+            step[valid, 1] = (g * J11 - f * J12)[valid] / det[valid]
+
+            # On a patch edge the gradient pushes outward: 1D Newton along the edge
+            fixed_u = ((uv[:, 0] <= low[:, 0]) & (f > 0)) | ((uv[:, 0] >= high[:, 0]) & (f < 0))
+            fixed_v = ((uv[:, 1] <= low[:, 1]) & (g > 0)) | ((uv[:, 1] >= high[:, 1]) & (g < 0))
+            E11, E22 = np.where(H11 > 0, H11, G11), np.where(H22 > 0, H22, G22)
+            step[fixed_v, 0] = np.divide(f, E11, out=np.zeros_like(f), where=E11 > 0)[fixed_v]
+            step[fixed_v, 1] = 0.0
+            step[fixed_u, 1] = np.divide(g, E22, out=np.zeros_like(g), where=E22 > 0)[fixed_u]
+            step[fixed_u, 0] = 0.0
+
+            moved = backtracking_step(self.evaluate_points, uv, step, dist, targets, low, high)
+            if np.all(moved < tolerance):
+                break
+
+        winners = group_argmin(queries, dist)
+        uv = uv[winners]
+        return uv, self.evaluate_points(uv), dist[winners]
+
+    def _projection_tree(self, samples_per_span: int = 16) -> Tuple[np.ndarray, KDTree, Tuple[int, int]]:
+        '''
+            Grid tessellation, its KD-tree and grid shape, rebuilt only when the
+            geometry changed. Each sample is padded by half the longest diagonal
+            of its cells: the sample nearest to any surface point is at most
+            that much farther from a query.
+        '''
+
+        key = self._geometry_key()
+        if self._projection is None or self._projection[0] != key:
+            us = np.linspace(self.knots_u[self.degree_u], self.knots_u[-self.degree_u - 1],
+                             samples_per_span * (self.weights.shape[0] - self.degree_u) + 1)
+            vs = np.linspace(self.knots_v[self.degree_v], self.knots_v[-self.degree_v - 1],
+                             samples_per_span * (self.weights.shape[1] - self.degree_v) + 1)
+            samples = self.evaluate_grid(us, vs)
+            diagonal = np.maximum(np.linalg.norm(samples[1:, 1:] - samples[:-1, :-1], axis=2),
+                                  np.linalg.norm(samples[1:, :-1] - samples[:-1, 1:], axis=2))
+            pad = np.zeros(samples.shape[:2])
+            for rows, cols in ((slice(1, None), slice(1, None)), (slice(1, None), slice(None, -1)),
+                               (slice(None, -1), slice(1, None)), (slice(None, -1), slice(None, -1))):
+                pad[rows, cols] = np.maximum(pad[rows, cols], diagonal / 2)
+
+            grid = np.stack(np.meshgrid(us, vs, indexing='ij'), axis=-1).reshape(-1, 2)
+            tree = KDTree(samples.reshape(len(grid), -1), pad=pad.ravel())
+            self._projection = (key, grid, tree, samples.shape[:2])
+        return self._projection[1:]
+
+    def insert_knot(self, t: float, direction: Direction = "u", times: int = 1) -> "NURBSSurface":
+        # Same surface with t inserted times more into the u or v knot vector
+        new_knots = np.full(times, t, dtype=np.float64)
+        return self.refine(new_knots, ()) if direction == "u" else self.refine((), new_knots)
+
+    def refine(self, knots_u: Sequence[float] = (), knots_v: Sequence[float] = ()) -> "NURBSSurface":
+        # Same surface with new knots inserted in each direction (Piegl & Tiller A5.5)
+        net, new_u = refine_knots(self._homogeneous_net(), self.knots_u, self.degree_u, knots_u)
+        net, new_v = refine_knots(net.swapaxes(0, 1), self.knots_v, self.degree_v, knots_v)
+        net = net.swapaxes(0, 1)
+        return NURBSSurface(net[..., :-1] / net[..., -1:], net[..., -1], new_u, new_v,
+                            self.degree_u, self.degree_v)
+
+    def bezier_patches(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        '''
+            Cached rational Bezier form -> (breaks_u, breaks_v, homogeneous
+            patches (Su, Sv, degree_u + 1, degree_v + 1, dim + 1)).
+        '''
+
+        key = self._geometry_key()
+        if self._bezier is None or self._bezier[0] != key:
+            breaks_u, strips = bezier_segments(self._homogeneous_net(), self.knots_u, self.degree_u)
+            breaks_v, patches = bezier_segments(strips.transpose(2, 0, 1, 3), self.knots_v, self.degree_v)
+            self._bezier = (key, breaks_u, breaks_v, patches.transpose(2, 0, 3, 1, 4))
+        return self._bezier[1:]
+
+    def evaluate_bezier(self, uv_pairs: np.ndarray,
+                        patch: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        '''
+            Evaluation of (k, 2) parameter pairs through the cached Bezier form
+            -> (k, dim). With patch given, all pairs must lie in that patch and
+            there is no span lookup at all.
+        '''
+
+        uv_pairs = np.atleast_2d(np.asarray(uv_pairs, dtype=np.float64))
+        breaks_u, breaks_v, patches = self.bezier_patches()
+        if patch is None:
+            iu = np.clip(np.searchsorted(breaks_u, uv_pairs[:, 0], side='right') - 1, 0, len(breaks_u) - 2)
+            iv = np.clip(np.searchsorted(breaks_v, uv_pairs[:, 1], side='right') - 1, 0, len(breaks_v) - 2)
+        else:
+            iu, iv = patch
+        su = (uv_pairs[:, 0] - breaks_u[iu]) / (breaks_u[iu + 1] - breaks_u[iu])
+        sv = (uv_pairs[:, 1] - breaks_v[iv]) / (breaks_v[iv + 1] - breaks_v[iv])
+        subscripts = 'ki,kj,ijd->kd' if patch is not None else 'ki,kj,kijd->kd'
+        points = np.einsum(subscripts, bernstein(su, self.degree_u), bernstein(sv, self.degree_v),
+                           patches[iu, iv])
+        return points[:, :-1] / points[:, -1:]
+
+    def _geometry_key(self) -> tuple:
+        # Identifies the current geometry for caches that are not cleared on in-place edits
+        return (hash(self.control_points.tobytes()), hash(self.weights.tobytes()),
+                hash(np.asarray(self.knots_u).tobytes()), hash(np.asarray(self.knots_v).tobytes()),
+                self.degree_u, self.degree_v)
+
+    def _homogeneous_net(self) -> np.ndarray:
+        # (n, m, dim + 1) control net [w * P, w]
+        weights = self.weights[..., None]
+        return np.concatenate([self.control_points * weights, weights], axis=-1)
+
     @staticmethod
     def _find_span(t: float, knots: np.ndarray, degree: int) -> int:
         # Same algorithm as curve version but parameterized
@@ -36,11 +282,12 @@ class NURBSSurface:
         return low
 
     @staticmethod
-    def _basis_functions(t: float, span: int, knots: np.ndarray, degree: int) -> np.ndarray:
+    def _basis_functions(t: float, span: int, knots: np.ndarray, degree: int,
+                         dtype: np.dtype = np.float64) -> np.ndarray:
         # Same as curve version but parameterized
-        left = np.zeros(degree + 1)
-        right = np.zeros(degree + 1)
-        N = np.zeros(degree + 1)
+        left = np.zeros(degree + 1, dtype=dtype)
+        right = np.zeros(degree + 1, dtype=dtype)
+        N = np.zeros(degree + 1, dtype=dtype)
         N[0] = 1.0
 
         for j in range(1, degree + 1):
@@ -58,7 +305,7 @@ class NURBSSurface:
 
     def _compute_surface_point(self, basis_u: np.ndarray, basis_v: np.ndarray,
                                span_u: int, span_v: int) -> np.ndarray:
-        point = np.zeros(self.control_points.shape[2])
+        point = np.zeros(self.control_points.shape[2], dtype=self.dtype)
         total_weight = 0.0
 
         for i in range(self.degree_u + 1):
@@ -1,44 +1,81 @@
 import numpy as np
 import numpy.typing as npt
-from typing import Literal
+from typing import Iterator, Literal, Optional, Union
+from nurbs import profiling
+
+CurveType = Literal["helix", "random", "constrained"]
+Seed = Union[None, int, np.random.SeedSequence]
 
 
 class SyntheticCurveGenerator:
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, seed: Seed = None):
         self.config = config
+        self.rng = np.random.default_rng(seed)
+
+    def generate(self, curve_type: CurveType) -> npt.NDArray[np.float64]:
+        return self.generate_batch(curve_type, 1)[0]
 
-    def generate(
+    def generate_batch(
         self,
-        curve_type: Literal["helix", "random", "constrained"]
+        curve_type: CurveType,
+        batch_size: int
     ) -> npt.NDArray[np.float64]:
-        t = np.linspace(0, 2*np.pi, 100)
-
-        match curve_type:
-            case "helix":
-                return self._helix(t)
-            case "random":
-                return self._random(t)
-            case "constrained":
-                return self._constrained(t)
-            case _:
-                raise ValueError(f"Unknown curve type: {curve_type}")
-
-    def _helix(self, t: npt.NDArray) -> npt.NDArray:
+        # (batch_size, points_per_curve, 3)
+        t = np.linspace(0, 2*np.pi, self.config.get("points_per_curve", 100))
+
+        with profiling.stage("synthetic.generate", batch_size * len(t)):
+            match curve_type:
+                case "helix":
+                    return self._helix(t, batch_size)
+                case "random":
+                    return self._random(t, batch_size)
+                case "constrained":
+                    return self._constrained(t, batch_size)
+                case _:
+                    raise ValueError(f"Unknown curve type: {curve_type}")
+
+    def stream(
+        self,
+        curve_type: CurveType,
+        batch_size: int = 32,
+        num_curves: Optional[int] = None
+    ) -> Iterator[npt.NDArray[np.float64]]:
+        '''
+            Yields (batch_size, points_per_curve, 3) batches until num_curves
+            curves are produced (config "num_samples" by default, endless if
+            neither is set). The last batch holds the remainder.
+        '''
+
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive")
+        remaining = self.config.get("num_samples") if num_curves is None else num_curves
+        return self._stream(curve_type, batch_size, remaining)
+
+    def _stream(self, curve_type: CurveType, batch_size: int,
+                remaining: Optional[int]) -> Iterator[npt.NDArray[np.float64]]:
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            yield self.generate_batch(curve_type, size)
+            if remaining is not None:
+                remaining -= size
+
+    def _helix(self, t: npt.NDArray, batch_size: int) -> npt.NDArray:
         x = np.cos(t)
         y = np.sin(t)
         z = 0.5 * t
-        return self._add_noise(np.stack([x, y, z], axis=1))
+        base = np.stack([x, y, z], axis=1)
+        return self._add_noise(np.broadcast_to(base, (batch_size, *base.shape)))
 
-    def _random(self, t: npt.NDArray) -> npt.NDArray:
-        rand_shape = np.random.randn(3, 3)  # Random 3x3 transformation
+    def _random(self, t: npt.NDArray, batch_size: int) -> npt.NDArray:
+        rand_shape = self.rng.standard_normal((batch_size, 3, 3))  # Random 3x3 transformations
         base = np.stack([np.cos(t), np.sin(t), t], axis=1)
         return self._add_noise(base @ rand_shape)
 
-    def _constrained(self, t: npt.NDArray) -> npt.NDArray:
-        curve = self._random(t)
-        curve[:, 2] = np.clip(curve[:, 2], *self.config["z_clip"])
-        return curve
+    def _constrained(self, t: npt.NDArray, batch_size: int) -> npt.NDArray:
+        curves = self._random(t, batch_size)
+        curves[..., 2] = np.clip(curves[..., 2], *self.config["z_clip"])
+        return curves
 
-    def _add_noise(self, curve: npt.NDArray) -> npt.NDArray:
-        noise = self.config["noise_level"] * np.random.randn(*curve.shape)
-        return curve + noise
+    def _add_noise(self, curves: npt.NDArray) -> npt.NDArray:
+        noise = self.config["noise_level"] * self.rng.standard_normal(curves.shape)
+        return curves + noise
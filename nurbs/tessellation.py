@@ -0,0 +1,168 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Optional
+from numpy.lib.stride_tricks import sliding_window_view
+from nurbs import backend
+from nurbs.curve import NURBSCurve
+from nurbs.surface import NURBSSurface
+
+
+# Parameter fractions probed inside every segment / cell
+PROBES = np.linspace(0, 1, 5)
+
+
+@dataclass
+class Polyline:
+    params: np.ndarray  # (k,)
+    points: np.ndarray  # (k, dim)
+
+    def save_obj(self, path: str) -> None:
+        with open(path, "w") as f:
+            _write_vertices(f, self.points)
+            f.write("l " + " ".join(map(str, range(1, len(self.points) + 1))) + "\n")
+
+
+@dataclass
+class TriangleMesh:
+    vertices: np.ndarray  # (k, 3)
+    faces: np.ndarray     # (f, 3) vertex indices, counter-clockwise around S_u x S_v
+    params: np.ndarray    # (k, 2) (u, v) of every vertex
+
+    def save_obj(self, path: str) -> None:
+        with open(path, "w") as f:
+            _write_vertices(f, self.vertices)
+            np.savetxt(f, self.params, fmt="vt %.9g %.9g")
+            np.savetxt(f, np.repeat(self.faces + 1, 2, axis=1), fmt="f %d/%d %d/%d %d/%d")
+
+
+def tessellate_curve(curve: NURBSCurve, tolerance: float = 1e-3, max_depth: int = 16,
+                     out: Optional[np.ndarray] = None) -> Polyline:
+    '''
+        Polyline within tolerance (chordal deviation) of the curve.
+        Starts from the distinct knots, so no segment straddles a knot, and
+        bisects every segment whose probes stray too far from its chord.
+        Points come in curve.dtype; with out (capacity, dim) given they are
+        written into its first rows and Polyline.points views them.
+    '''
+
+    if tolerance <= 0:
+        raise ValueError("Tolerance must be positive")
+    params = _breakpoints(curve.knots, curve.degree)
+    active = np.ones(len(params) - 1, dtype=bool)
+    for _ in range(max_depth):
+        segments = np.flatnonzero(active)
+        start, stop = params[segments], params[segments + 1]
+        probes = _curve_points(curve, (start[:, None] + (stop - start)[:, None] * PROBES).ravel())
+        probes = probes.reshape(len(segments), len(PROBES), -1)
+        chord = probes[:, -1:] - probes[:, :1]
+        length2 = np.maximum(np.sum(chord ** 2, axis=2, keepdims=True), np.finfo(float).tiny)
+        along = np.clip(np.sum((probes - probes[:, :1]) * chord, axis=2, keepdims=True) / length2, 0, 1)
+        deviation = np.linalg.norm(probes - probes[:, :1] - along * chord, axis=2).max(axis=1)
+
+        split = deviation > tolerance
+        if not split.any():
+            break
+        active[segments[~split]] = False
+        params = np.insert(params, segments[split] + 1, (start + stop)[split] / 2)
+        active = np.insert(active, segments[split] + 1, True)
+
+    return Polyline(params, _curve_points(curve, params, _head(out, len(params))))
+
+
+def _curve_points(curve: NURBSCurve, ts: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    # Straight to the backend: one-off probe parameters would evict the curve's cached bases
+    ts = np.asarray(ts, dtype=curve.dtype)
+    return backend.curve_points(ts, curve.control_points, curve.weights, curve.knots, curve.degree, out)
+
+
+def tessellate_surface(surface: NURBSSurface, tolerance: float = 1e-3, max_depth: int = 12,
+                       out: Optional[np.ndarray] = None) -> TriangleMesh:
+    '''
+        Triangle mesh within tolerance of the surface on a rectilinear grid
+        that starts from the distinct knots in u and v. A cell that misses the
+        tolerance splits the whole column in u and/or row in v, depending on
+        which isocurves are too curved, so the mesh never has T-junctions.
+        Each quad is cut along the diagonal with the smaller deviation.
+        out works as in tessellate_curve, for the vertices.
+    '''
+
+    if tolerance <= 0:
+        raise ValueError("Tolerance must be positive")
+    us = _breakpoints(surface.knots_u, surface.degree_u)
+    vs = _breakpoints(surface.knots_v, surface.degree_v)
+    for depth in range(max_depth + 1):
+        fine = surface.evaluate_grid(_refine(us, len(PROBES) - 1), _refine(vs, len(PROBES) - 1))
+        cells = sliding_window_view(fine, (len(PROBES), len(PROBES)), axis=(0, 1))
+        cells = np.moveaxis(cells[::len(PROBES) - 1, ::len(PROBES) - 1], 2, -1)  # (nu, nv, 5, 5, dim)
+        deviation, flip = _triangulation_error(cells)
+
+        fail = deviation > tolerance
+        if not fail.any() or depth == max_depth:
+            break
+        s = PROBES[:, None, None]
+        along_u = s * cells[:, :, -1:] + (1 - s) * cells[:, :, :1]
+        along_v = s[:, 0] * cells[:, :, :, -1:] + (1 - s[:, 0]) * cells[:, :, :, :1]
+        curved_u = np.linalg.norm(cells - along_u, axis=-1).max(axis=(2, 3)) > tolerance / 2
+        curved_v = np.linalg.norm(cells - along_v, axis=-1).max(axis=(2, 3)) > tolerance / 2
+        twisted = ~(curved_u | curved_v)
+        us = _split(us, (fail & (curved_u | twisted)).any(axis=1))
+        vs = _split(vs, (fail & (curved_v | twisted)).any(axis=0))
+
+    index = np.arange(len(us) * len(vs)).reshape(len(us), len(vs))
+    a, b = index[:-1, :-1].ravel(), index[1:, :-1].ravel()
+    c, d = index[:-1, 1:].ravel(), index[1:, 1:].ravel()
+    flip = flip.ravel()[:, None]
+    faces = np.concatenate([
+        np.where(flip, np.stack([a, b, c], axis=1), np.stack([a, b, d], axis=1)),
+        np.where(flip, np.stack([b, d, c], axis=1), np.stack([a, d, c], axis=1))
+    ])
+    params = np.stack(np.meshgrid(us, vs, indexing='ij'), axis=-1).reshape(-1, 2)
+    vertices = fine[::len(PROBES) - 1, ::len(PROBES) - 1].reshape(len(params), -1)
+    if out is not None:
+        _head(out, len(params))[...] = vertices
+        vertices = out[:len(params)]
+    return TriangleMesh(vertices, faces, params)
+
+
+def _triangulation_error(cells: np.ndarray):
+    # Deviation of the probes from either triangulation of each quad -> (best, use 10-01 diagonal)
+    s, t = PROBES[:, None, None], PROBES[None, :, None]
+    c00, c10 = cells[:, :, :1, :1], cells[:, :, -1:, :1]
+    c01, c11 = cells[:, :, :1, -1:], cells[:, :, -1:, -1:]
+    main = np.where(s >= t, c00 + s * (c10 - c00) + t * (c11 - c10),
+                    c00 + t * (c01 - c00) + s * (c11 - c01))
+    anti = np.where(s + t <= 1, c00 + s * (c10 - c00) + t * (c01 - c00),
+                    c11 + (1 - s) * (c01 - c11) + (1 - t) * (c10 - c11))
+    main = np.linalg.norm(cells - main, axis=-1).max(axis=(2, 3))
+    anti = np.linalg.norm(cells - anti, axis=-1).max(axis=(2, 3))
+    return np.minimum(main, anti), anti < main
+
+
+def _head(out: Optional[np.ndarray], count: int) -> Optional[np.ndarray]:
+    # First count rows of a caller buffer sized for the largest expected tessellation
+    if out is None:
+        return None
+    if len(out) < count:
+        raise ValueError(f"Output buffer holds {len(out)} points, the tessellation needs {count}")
+    return out[:count]
+
+
+def _breakpoints(knots: np.ndarray, degree: int) -> np.ndarray:
+    knots = np.asarray(knots, dtype=np.float64)
+    return np.unique(knots[degree:len(knots) - degree])
+
+
+def _refine(params: np.ndarray, divisions: int) -> np.ndarray:
+    steps = np.linspace(0, 1, divisions + 1)[:-1]
+    fine = params[:-1, None] + np.diff(params)[:, None] * steps
+    return np.append(fine.ravel(), params[-1])
+
+
+def _split(params: np.ndarray, intervals: np.ndarray) -> np.ndarray:
+    mids = (params[:-1] + params[1:])[intervals] / 2
+    return np.insert(params, np.flatnonzero(intervals) + 1, mids)
+
+
+def _write_vertices(f, points: np.ndarray) -> None:
+    points = np.pad(points, ((0, 0), (0, 3 - points.shape[1])))
+    np.savetxt(f, points, fmt="v %.9g %.9g %.9g")
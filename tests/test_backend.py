@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from nurbs import backend
+from nurbs.curve import NURBSCurve
+from nurbs.surface import NURBSSurface
+
+
+@pytest.mark.skipif("numba" not in backend.available_backends(), reason="numba not installed")
+class TestBackends:
+    def _curve(self, rng):
+        knots = np.array([0, 0, 0, 0, 0.3, 0.3, 0.6, 1, 1, 1, 1], dtype=np.float64)
+        return NURBSCurve(rng.random((7, 3)), rng.random(7) + 0.5, knots, degree=3)
+
+    def test_kernels_match_numpy(self):
+        """Compiled span search and basis agree with the NumPy versions"""
+        rng = np.random.default_rng(0)
+        curve = self._curve(rng)
+        ts = np.concatenate([rng.random(200), curve.knots])
+
+        results = {}
+        for name in ("numpy", "numba"):
+            with backend.use_backend(name):
+                spans = backend.find_spans(ts, curve.knots, curve.degree)
+                results[name] = (spans, backend.basis_functions(ts, spans, curve.knots, curve.degree))
+        assert np.array_equal(results["numpy"][0], results["numba"][0])
+        assert np.allclose(results["numpy"][1], results["numba"][1])
+
+    def test_curve_and_surface_points(self):
+        """Both backends evaluate the same curve and surface points"""
+        rng = np.random.default_rng(1)
+        curve = self._curve(rng)
+        surface = NURBSSurface(rng.random((6, 5, 3)), rng.random((6, 5)) + 0.5,
+                               np.array([0, 0, 0, 0, 0.3, 0.6, 1, 1, 1, 1]),
+                               np.array([0, 0, 0, 0.5, 0.5, 1, 1, 1]), 3, 2)
+        ts, uv = np.linspace(0, 1, 101), rng.random((100, 2))
+
+        results = {}
+        for name in ("numpy", "numba"):
+            with backend.use_backend(name):
+                results[name] = (curve.evaluate_many(ts), curve.evaluate(0.45),
+                                 surface.evaluate_points(uv), surface.evaluate(0.2, 0.7))
+        for numpy_result, numba_result in zip(results["numpy"], results["numba"]):
+            assert np.allclose(numpy_result, numba_result)
+
+    def test_basis_cache_serves_both_backends(self):
+        """Cached bases are reused by either backend, only the contraction reruns"""
+        rng = np.random.default_rng(2)
+        curve = self._curve(rng)
+        ts = np.linspace(0, 1, 50)
+
+        results = {}
+        for name in ("numpy", "numba"):
+            with backend.use_backend(name):
+                results[name] = curve.evaluate_many(ts)
+        assert curve.cache_info()["hits"] == 1 and curve.cache_info()["misses"] == 1
+        assert np.allclose(results["numpy"], results["numba"])
+
+        curve.weights[0] = 2.0
+        with backend.use_backend("numba"):
+            moved = curve.evaluate_many(ts)
+        with backend.use_backend("numpy"):
+            assert np.allclose(moved, curve.evaluate_many(ts))
+        assert curve.cache_info()["hits"] == 3
+
+    def test_output_buffers_are_checked(self):
+        """Wrongly sized out buffers raise instead of reaching the kernels"""
+        rng = np.random.default_rng(3)
+        curve = self._curve(rng)
+        surface = NURBSSurface(rng.random((6, 5, 3)), rng.random((6, 5)) + 0.5,
+                               np.array([0, 0, 0, 0, 0.3, 0.6, 1, 1, 1, 1]),
+                               np.array([0, 0, 0, 0.5, 0.5, 1, 1, 1]), 3, 2)
+        ts, uv = np.linspace(0, 1, 1000), rng.random((1000, 2))
+
+        with backend.use_backend("numba"):
+            for out in (np.zeros((900, 3)), np.zeros((1000, 2)), np.zeros((1000, 3), dtype=np.int64)):
+                with pytest.raises(ValueError):
+                    curve.evaluate_many(ts, out=out)
+                with pytest.raises(ValueError):
+                    backend.curve_points(ts, curve.control_points, curve.weights, curve.knots, 3, out)
+                with pytest.raises(ValueError):
+                    surface.evaluate_points(uv, out=out)
+            out = np.zeros((1000, 3))
+            assert curve.evaluate_many(ts, out=out) is out
+
+
+def test_backend_switch():
+    """use_backend restores the previous backend, unknown names are rejected"""
+    before = backend.get_backend()
+    with backend.use_backend("numpy"):
+        assert backend.get_backend() == "numpy"
+    assert backend.get_backend() == before
+    with pytest.raises(ValueError):
+        backend.set_backend("cuda")
@@ -0,0 +1,67 @@
+import numpy as np
+from nurbs.curve import NURBSCurve
+from nurbs.batch import NURBSCurveBatch
+
+
+class TestNURBSCurveBatch:
+    def _random_batch(self, shared_knots: bool) -> NURBSCurveBatch:
+        B, n, degree = 4, 7, 3
+        if shared_knots:
+            knots = np.tile([0, 0, 0, 0, 0.25, 0.5, 0.75, 1, 1, 1, 1], (B, 1))
+        else:
+            internal = np.sort(np.random.rand(B, n - degree - 1), axis=1)
+            knots = np.concatenate([np.zeros((B, degree + 1)), internal,
+                                    np.ones((B, degree + 1))], axis=1)
+        return NURBSCurveBatch(
+            control_points=np.random.rand(B, n, 3),
+            weights=np.random.rand(B, n) + 0.5,
+            knots=knots,
+            degree=degree
+        )
+
+    def test_views_share_memory(self):
+        """Indexed curves and slices are zero-copy views"""
+        batch = self._random_batch(shared_knots=True)
+
+        curve = batch[2]
+        assert isinstance(curve, NURBSCurve)
+        assert np.shares_memory(curve.control_points, batch.control_points)
+
+        sub = batch[1:3]
+        assert isinstance(sub, NURBSCurveBatch) and len(sub) == 2
+        assert np.shares_memory(sub.knots, batch.knots)
+        assert [len(b) for b in batch.batches(3)] == [3, 1]
+
+    def test_stepped_slice_is_a_view(self):
+        """Stepped slices stay views and evaluate like their curves"""
+        batch = self._random_batch(shared_knots=False)
+        sub = batch[::2]
+
+        for name in ("control_points", "weights", "knots"):
+            assert np.shares_memory(getattr(sub, name), getattr(batch, name))
+        ts = np.linspace(0, 1, 9)
+        expected = np.stack([batch[i].evaluate_many(ts) for i in (0, 2)])
+        assert np.allclose(sub.evaluate_many(ts), expected)
+
+        sub.control_points[1, 0] = 5.0
+        assert np.all(batch.control_points[2, 0] == 5.0)
+
+    def test_validation(self):
+        """Shape mismatches are rejected for the whole batch"""
+        batch = self._random_batch(shared_knots=True)
+        try:
+            NURBSCurveBatch(batch.control_points, batch.weights[:, :-1], batch.knots, 3)
+            assert False
+        except ValueError:
+            pass
+
+    def test_evaluate_many_matches_curves(self):
+        """Batched evaluation agrees with per-curve evaluation"""
+        ts = np.linspace(0, 1, 33)
+        for shared_knots in (True, False):
+            batch = self._random_batch(shared_knots)
+            points = batch.evaluate_many(ts)
+
+            assert points.shape == (4, 33, 3)
+            for i in range(len(batch)):
+                assert np.allclose(points[i], batch[i].evaluate_many(ts), atol=1e-12)
@@ -1,5 +1,7 @@
 import numpy as np
+import pytest
 from nurbs.curve import NURBSCurve
+from nurbs.basis import find_spans
 
 
 class TestNURBSCurve:
@@ -112,4 +114,169 @@ class TestNURBSCurve:
         
         # Just before end
         basis = nurbs.basis_functions(span=3, t=0.999)
-        assert np.allclose(basis.sum(), 1.0, atol=1e-6)
\ No newline at end of file
+        assert np.allclose(basis.sum(), 1.0, atol=1e-6)
+
+    def test_find_spans_matches_scalar(self):
+        """Vectorized span search agrees with find_span"""
+        knots = np.array([0, 0, 0, 1, 2, 2, 3, 3, 3], dtype=np.float64)
+        nurbs = NURBSCurve(np.random.rand(6, 2), np.ones(6), knots, degree=2)
+        ts = np.array([-0.5, 0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5])
+
+        spans = find_spans(ts, knots, 2)
+        assert list(spans) == [nurbs.find_span(t) for t in ts]
+
+    def test_evaluate_many_matches_scalar(self):
+        """Batched evaluation agrees with evaluate to floating-point tolerance"""
+        knots = np.array([0, 0, 0, 0, 0.2, 0.5, 0.5, 0.8, 1, 1, 1, 1])
+        control_points = np.random.rand(8, 3)
+        weights = np.random.rand(8) + 0.5
+        nurbs = NURBSCurve(control_points, weights, knots, degree=3)
+
+        ts = np.linspace(0, 1, 57)
+        expected = np.array([nurbs.evaluate(t) for t in ts])
+        assert nurbs.evaluate_many(ts).shape == (57, 3)
+        assert np.allclose(nurbs.evaluate_many(ts), expected, atol=1e-12)
+
+    def test_basis_cache(self):
+        """Repeated grids hit the cache, knot edits invalidate it"""
+        knots = np.array([0, 0, 0, 0.5, 1, 1, 1], dtype=np.float64)
+        nurbs = NURBSCurve(np.random.rand(4, 2), np.ones(4), knots, degree=2)
+        ts = np.linspace(0, 1, 11)
+
+        first = nurbs.evaluate_many(ts)
+        nurbs.control_points = nurbs.control_points + 1.0
+        moved = nurbs.evaluate_many(ts)
+        assert np.allclose(moved, first + 1.0)
+        assert nurbs.cache_info()["hits"] == 1
+
+        nurbs.knots[3] = 0.25
+        expected = np.array([nurbs.evaluate(t) for t in ts])
+        assert np.allclose(nurbs.evaluate_many(ts), expected)
+        assert nurbs.cache_info()["misses"] == 2
+
+        nurbs.knots = np.array([0, 0, 0, 0.75, 1, 1, 1], dtype=np.float64)
+        assert nurbs.cache_info()["size"] == 0
+
+    def test_sparse_basis_batch_evaluation(self):
+        """Precomputed basis evaluates a batch of control nets"""
+        knots = np.array([0, 0, 0, 0, 0.3, 0.7, 1, 1, 1, 1], dtype=np.float64)
+        nurbs = NURBSCurve(np.random.rand(6, 3), np.random.rand(6) + 0.5, knots, degree=3)
+        ts = np.linspace(0, 1, 21)
+        basis = nurbs.sparse_basis(ts)
+
+        nets = np.random.rand(5, 6, 3)
+        weights = np.random.rand(5, 6) + 0.5
+        expected = np.array([
+            NURBSCurve(net, w, knots, degree=3).evaluate_many(ts)
+            for net, w in zip(nets, weights)
+        ])
+        assert np.allclose(basis.evaluate(nets, weights), expected)
+
+        basis.DENSE_LIMIT = 0
+        assert np.allclose(basis.evaluate(nets, weights), expected)
+        assert np.allclose(basis.evaluate(nets), basis.to_dense() @ nets)
+
+    def test_derivatives_match_finite_differences(self):
+        """Analytic derivatives agree with central differences"""
+        knots = np.array([0, 0, 0, 0, 0.3, 0.6, 1, 1, 1, 1], dtype=np.float64)
+        nurbs = NURBSCurve(np.random.rand(6, 3), np.random.rand(6) + 0.5, knots, degree=3)
+        ts = np.array([0.1, 0.45, 0.8])
+        h = 1e-5
+
+        ders = nurbs.derivatives(ts, order=2)
+        assert ders.shape == (3, 3, 3)
+        assert np.allclose(ders[0], nurbs.evaluate_many(ts))
+        fd1 = (nurbs.evaluate_many(ts + h) - nurbs.evaluate_many(ts - h)) / (2 * h)
+        fd2 = (nurbs.derivatives(ts + h)[1] - nurbs.derivatives(ts - h)[1]) / (2 * h)
+        assert np.allclose(ders[1], fd1, atol=1e-6)
+        assert np.allclose(ders[2], fd2, atol=1e-4)
+
+    def test_circle_curvature(self):
+        """Exact rational quarter circle has unit curvature and unit tangents"""
+        ctrl = np.array([[1, 0], [1, 1], [0, 1]], dtype=np.float64)
+        weights = np.array([1, np.sqrt(2)/2, 1])
+        knots = np.array([0, 0, 0, 1, 1, 1], dtype=np.float64)
+        nurbs = NURBSCurve(ctrl, weights, knots, 2)
+        ts = np.linspace(0, 1, 9)
+
+        assert np.allclose(nurbs.curvature(ts), 1.0)
+        assert np.allclose(np.linalg.norm(nurbs.tangents(ts), axis=1), 1.0)
+        assert nurbs.derivatives(ts, order=4).shape == (5, 9, 2)
+
+    def test_closest_points(self):
+        """Projection matches a dense brute-force search and caches its tree"""
+        rng = np.random.default_rng(0)
+        knots = np.array([0, 0, 0, 0, 0.3, 0.6, 1, 1, 1, 1], dtype=np.float64)
+        nurbs = NURBSCurve(rng.random((6, 3)), rng.random(6) + 0.5, knots, degree=3)
+        queries = rng.random((50, 3))
+
+        ts, closest, dist = nurbs.closest_points(queries)
+        dense = nurbs.evaluate_many(np.linspace(0, 1, 200001))
+        brute = np.min(np.linalg.norm(queries[:, None] - dense[None], axis=2), axis=1)
+        assert np.all(dist <= brute + 1e-9)
+        assert np.allclose(closest, nurbs.evaluate_many(ts))
+
+        tree = nurbs._projection_tree()[1]
+        nurbs.closest_points(queries[:5])
+        assert nurbs._projection_tree()[1] is tree
+        nurbs.control_points = nurbs.control_points + 1.0
+        assert nurbs._projection_tree()[1] is not tree
+
+    def test_closest_points_at_kink(self):
+        """Points whose closest location is a C0 knot project onto the kink"""
+        ctrl = np.array([[0, 0], [1, 0], [2, 0], [2, 1], [2, 2]], dtype=np.float64)
+        knots = np.array([0, 0, 0, 0.5, 0.5, 1, 1, 1], dtype=np.float64)
+        nurbs = NURBSCurve(ctrl, np.ones(5), knots, degree=2)
+
+        ts, closest, dist = nurbs.closest_points(np.array([[3.0, -1.0], [1.0, 1.0]]))
+        assert np.allclose(closest[0], [2, 0])
+        assert np.allclose(dist, [np.sqrt(2), 1.0])
+
+    def test_knot_refinement_preserves_shape(self):
+        """Inserted and refined knots change the representation, not the curve"""
+        rng = np.random.default_rng(0)
+        knots = np.array([0, 0, 0, 0, 0.3, 0.3, 0.6, 1, 1, 1, 1], dtype=np.float64)
+        nurbs = NURBSCurve(rng.random((7, 3)), rng.random(7) + 0.5, knots, degree=3)
+        ts = np.linspace(0, 1, 101)
+
+        inserted = nurbs.insert_knot(0.45, times=2)
+        assert len(inserted.control_points) == 9
+        refined = nurbs.refine([0.1, 0.3, 0.8, 0.8])
+        assert np.allclose(refined.knots, np.sort(np.concatenate([knots, [0.1, 0.3, 0.8, 0.8]])))
+        for other in (inserted, refined):
+            assert np.allclose(other.evaluate_many(ts), nurbs.evaluate_many(ts))
+
+        with pytest.raises(ValueError):
+            nurbs.insert_knot(0.3, times=2)
+
+    def test_bezier_evaluation(self):
+        """Cached Bezier form matches B-spline evaluation, per segment too"""
+        rng = np.random.default_rng(0)
+        knots = np.array([0, 0, 0, 0.25, 0.5, 0.5, 1, 1, 1], dtype=np.float64)
+        nurbs = NURBSCurve(rng.random((6, 2)), rng.random(6) + 0.5, knots, degree=2)
+        ts = np.linspace(0, 1, 101)
+
+        breaks, segments = nurbs.bezier_segments()
+        assert np.allclose(breaks, [0, 0.25, 0.5, 1])
+        assert segments.shape == (3, 3, 3)
+        assert np.allclose(nurbs.evaluate_bezier(ts), nurbs.evaluate_many(ts))
+
+        local = np.linspace(0.5, 1, 11)
+        assert np.allclose(nurbs.evaluate_bezier(local, segment=2), nurbs.evaluate_many(local))
+        assert nurbs.bezier_segments()[1] is segments
+
+    def test_float32_and_out(self):
+        """float32 geometry evaluates in float32, out buffers are filled in place"""
+        rng = np.random.default_rng(0)
+        knots = np.array([0, 0, 0, 0, 0.5, 1, 1, 1, 1], dtype=np.float64)
+        nurbs = NURBSCurve(rng.random((5, 3)), rng.random(5) + 0.5, knots, degree=3)
+        single = NURBSCurve(nurbs.control_points.astype(np.float32),
+                            nurbs.weights.astype(np.float32), knots, degree=3)
+        ts = np.linspace(0, 1, 101)
+
+        assert single.evaluate_many(ts).dtype == np.float32
+        assert single.evaluate(0.3).dtype == np.float32
+        assert np.allclose(single.evaluate_many(ts), nurbs.evaluate_many(ts), atol=1e-5)
+        out = np.empty((len(ts), 3), dtype=np.float32)
+        assert single.evaluate_many(ts, out=out) is out
+        assert np.array_equal(out, single.evaluate_many(ts))
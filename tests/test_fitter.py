@@ -0,0 +1,184 @@
+import numpy as np
+from interpolation.fitter import NURBSFitter
+from interpolation.banded import bands_to_dense, collocation_bands, lu_factor_banded, lu_solve_banded
+
+
+class TestNURBSFitter:
+    def test_interpolation_hits_targets(self):
+        """Interpolated curve passes through every input point"""
+        points = np.cumsum(np.random.rand(40, 3), axis=0)
+        curve = NURBSFitter.interpolate(points, degree=3)
+        params = NURBSFitter.chord_length_parameterization(points)
+
+        assert np.allclose(curve.evaluate_many(params), points, atol=1e-8)
+
+    def test_banded_matches_dense(self):
+        """Both solvers produce the same control points"""
+        points = np.cumsum(np.random.rand(60, 2), axis=0)
+        banded = NURBSFitter.interpolate(points, degree=3, solver="banded")
+        dense = NURBSFitter.interpolate(points, degree=3, solver="dense")
+
+        assert np.allclose(banded.control_points, dense.control_points, atol=1e-8)
+        assert np.array_equal(banded.knots, dense.knots)
+
+    def test_banded_lu_solve(self):
+        """Banded LU agrees with a dense solve on a diagonally dominant matrix"""
+        n, l, u = 12, 2, 1
+        A = np.zeros((n, n))
+        for i in range(n):
+            for j in range(max(0, i - l), min(n, i + u + 1)):
+                A[i, j] = np.random.rand()
+            A[i, i] += 4.0
+        ab = np.zeros((l + u + 1, n))
+        for j in range(n):
+            for i in range(max(0, j - u), min(n, j + l + 1)):
+                ab[u + i - j, j] = A[i, j]
+
+        b = np.random.rand(n, 3)
+        x = lu_solve_banded(lu_factor_banded(ab, l, u), l, u, b)
+        assert np.allclose(x, np.linalg.solve(A, b))
+
+    def test_batched_collocation_lu(self):
+        """A stack of collocation systems factors and solves like each one alone"""
+        params = np.sort(np.random.rand(4, 15), axis=1)
+        params[:, 0], params[:, -1] = 0, 1
+        knots = NURBSFitter.generate_knots(params, 3)
+        params[1, 5] = knots[1, 6]  # parameter exactly on a knot
+        ab, l, u = collocation_bands(params, knots, 3)
+        b = np.random.rand(4, 15, 2)
+        x = lu_solve_banded(lu_factor_banded(ab, l, u), l, u, b)
+
+        for i in range(4):
+            single, l_i, u_i = collocation_bands(params[i], knots[i], 3)
+            A = bands_to_dense(single, l_i, u_i)
+            assert np.allclose(bands_to_dense(ab[i], l, u), A)
+            assert np.allclose(x[i], np.linalg.solve(A, b[i]))
+
+    def test_interpolate_batch_shared(self):
+        """Shared parameterization interpolates every curve of the batch"""
+        points = np.cumsum(np.random.rand(5, 30, 3), axis=1)
+        batch = NURBSFitter.interpolate_batch(points, degree=3)
+        params = NURBSFitter.batch_chord_length_parameterization(points).mean(axis=0)
+
+        assert batch.control_points.shape == (5, 30, 3)
+        assert batch.knots.shape == (5, 34)
+        for curve, targets in zip([batch[i] for i in range(5)], points):
+            assert np.allclose(curve.evaluate_many(params), targets, atol=1e-8)
+
+    def test_interpolate_batch_chord_matches_single(self):
+        """Per-curve chord parameterization reproduces interpolate"""
+        points = np.cumsum(np.random.rand(4, 20, 2), axis=1)
+        batch = NURBSFitter.interpolate_batch(points, degree=2, parameterization="chord")
+
+        for i, cloud in enumerate(points):
+            single = NURBSFitter.interpolate(cloud, degree=2)
+            assert np.allclose(batch.control_points[i], single.control_points)
+            assert np.allclose(batch.knots[i], single.knots)
+
+    def test_interpolate_grouped(self):
+        """Clouds of different sizes are grouped by shape"""
+        clouds = [np.cumsum(np.random.rand(n, 3), axis=0) for n in (10, 15, 10, 15, 12)]
+        groups = NURBSFitter.interpolate_grouped(clouds, degree=3)
+
+        assert sorted(len(batch) for _, batch in groups) == [1, 2, 2]
+        for indices, batch in groups:
+            assert all(batch.control_points.shape[1] == len(clouds[i]) for i in indices)
+
+    def test_approximate_noisy_samples(self):
+        """Few control points follow many noisy samples and pin the end points"""
+        rng = np.random.default_rng(0)
+        t = np.linspace(0, 2 * np.pi, 5000)
+        clean = np.column_stack([t, np.sin(t)])
+        points = clean + rng.normal(0, 0.01, clean.shape)
+        curve = NURBSFitter.approximate(points, num_control_points=20, degree=3)
+
+        assert curve.control_points.shape == (20, 2)
+        assert np.allclose(curve.control_points[[0, -1]], points[[0, -1]])
+        params = NURBSFitter.chord_length_parameterization(points)
+        assert np.abs(curve.evaluate_many(params) - clean).max() < 0.05
+
+    def test_approximate_banded_matches_dense(self):
+        """Banded normal equations agree with a dense least-squares solve"""
+        points = np.cumsum(np.random.rand(300, 3), axis=0)
+        banded = NURBSFitter.approximate(points, num_control_points=25, solver="banded")
+        dense = NURBSFitter.approximate(points, num_control_points=25, solver="dense")
+
+        assert np.allclose(banded.control_points, dense.control_points, atol=1e-8)
+
+    def test_approximate_adaptive_meets_tolerance(self):
+        """Adaptive refinement stops at the tolerance, tighter bounds need more control points"""
+        rng = np.random.default_rng(0)
+        t = np.linspace(0, 4 * np.pi, 20000)
+        points = np.column_stack([t, np.sin(t) * np.exp(-t / 4)]) + rng.normal(0, 1e-4, (len(t), 2))
+        params = NURBSFitter.chord_length_parameterization(points)
+
+        coarse, coarse_stats = NURBSFitter.approximate_adaptive(points, tolerance=1e-2)
+        fine, fine_stats = NURBSFitter.approximate_adaptive(points, tolerance=1e-3)
+        for curve, stats, tolerance in ((coarse, coarse_stats, 1e-2), (fine, fine_stats, 1e-3)):
+            error = np.linalg.norm(curve.evaluate_many(params) - points, axis=1)
+            assert stats.converged and np.isclose(stats.max_error, error.max())
+            assert error.max() <= tolerance
+            assert stats.control_points == len(curve.control_points)
+        assert coarse_stats.control_points < fine_stats.control_points
+
+        # Incremental refits agree with solving from scratch on the final knots
+        direct = NURBSFitter.solve_least_squares(points, params, fine.knots, degree=3)
+        assert np.allclose(fine.control_points, direct)
+
+        capped, capped_stats = NURBSFitter.approximate_adaptive(points, 1e-6, max_control_points=12)
+        assert not capped_stats.converged and len(capped.control_points) <= 12
+
+    def test_generate_knots_averaging(self):
+        """Knots are the running mean of degree consecutive inner parameters"""
+        params = np.sort(np.random.rand(12))
+        knots = NURBSFitter.generate_knots(params, degree=3)
+        expected = [np.mean(params[i:i + 3]) for i in range(1, 12 - 3)]
+        assert np.allclose(knots[4:-4], expected)
+        assert len(knots) == 12 + 3 + 1
+
+    def test_single_bezier_segment(self):
+        """degree + 1 points interpolate with a knot vector free of internal knots"""
+        points = np.random.rand(4, 3)
+        curve = NURBSFitter.interpolate(points, degree=3)
+        assert np.array_equal(curve.knots, [0, 0, 0, 0, 1, 1, 1, 1])
+        params = NURBSFitter.chord_length_parameterization(points)
+        assert np.allclose(curve.evaluate_many(params), points)
+
+        batch = NURBSFitter.interpolate_batch(np.random.rand(5, 4, 3), degree=3, parameterization="chord")
+        assert batch.knots.shape == (5, 8)
+
+    def test_approximate_rational_recovers_circle(self):
+        """Three control points and optimized weights reproduce a quarter circle"""
+        angles = np.linspace(0, np.pi / 2, 500)
+        points = np.column_stack([np.cos(angles), np.sin(angles)])
+        curve = NURBSFitter.approximate_rational(points, num_control_points=3, degree=2)
+
+        assert np.allclose(curve.weights[1] / curve.weights[0], np.sqrt(2) / 2, atol=1e-6)
+        assert np.allclose(np.linalg.norm(curve.evaluate_many(np.linspace(0, 1, 50)), axis=1), 1)
+        assert np.allclose(curve.control_points[[0, -1]], points[[0, -1]])
+
+    def test_approximate_rational_beats_polynomial(self):
+        """Optimized weights lower the error of a helix fit with the same control points"""
+        t = np.linspace(0, 4 * np.pi, 2000)
+        points = np.column_stack([np.cos(t), np.sin(t), 0.5 * t])
+        rational = NURBSFitter.approximate_rational(points, num_control_points=12)
+        polynomial = NURBSFitter.approximate(points, num_control_points=12)
+
+        assert np.all(rational.weights > 0)
+        assert rational.closest_points(points)[2].max() < polynomial.closest_points(points)[2].max()
+
+    def test_float32_fits_into_buffers(self):
+        """Fits solve in float64 but return control points in the dtype of the points"""
+        points = np.cumsum(np.random.default_rng(0).random((60, 3)), axis=0)
+        single = points.astype(np.float32)
+
+        out = np.empty((60, 3), dtype=np.float32)
+        curve = NURBSFitter.interpolate(single, out=out)
+        assert curve.control_points is out and curve.weights.dtype == np.float32
+        assert np.allclose(out, NURBSFitter.interpolate(points).control_points, atol=1e-4)
+
+        assert NURBSFitter.approximate(single, 10).control_points.dtype == np.float32
+        out = np.empty((4, 60, 3), dtype=np.float32)
+        batch = NURBSFitter.interpolate_batch(np.stack([single] * 4), out=out)
+        assert batch.control_points is out
+        assert batch.evaluate_many(np.linspace(0, 1, 20)).dtype == np.float32
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from nurbs import parallel
+from nurbs.batch import NURBSCurveBatch
+from nurbs.curve import NURBSCurve
+from nurbs.surface import NURBSSurface
+
+
+class TestParallelEvaluation:
+    def _curve(self, rng):
+        knots = np.array([0, 0, 0, 0, 0.25, 0.5, 0.75, 1, 1, 1, 1], dtype=np.float64)
+        return NURBSCurve(rng.random((7, 3)), rng.random(7) + 0.5, knots, degree=3)
+
+    def _surface(self, rng):
+        knots = np.array([0, 0, 0, 0, 0.5, 1, 1, 1, 1], dtype=np.float64)
+        return NURBSSurface(rng.random((5, 5, 3)), rng.random((5, 5)) + 0.5, knots, knots, 3, 3)
+
+    def test_curve_matches_serial(self):
+        """Chunked threads give the serial result and fill the given buffer"""
+        curve = self._curve(np.random.default_rng(0))
+        ts = np.linspace(0, 1, 1001)
+        out = np.empty((len(ts), 3))
+        result = parallel.evaluate_curve(curve, ts, out=out, workers=4, chunk_size=100)
+        assert result is out
+        assert np.allclose(out, curve.evaluate_many(ts))
+
+    def test_batch_matches_serial(self):
+        """Per-curve parameters are chunked together with their curves"""
+        rng = np.random.default_rng(1)
+        batch = NURBSCurveBatch.from_curves([self._curve(rng) for _ in range(10)])
+        ts = np.sort(rng.random((10, 50)), axis=1)
+        result = parallel.evaluate_batch(batch, ts, workers=3, chunk_size=3)
+        assert np.allclose(result, batch.evaluate_many(ts))
+
+    def test_surface_matches_serial(self):
+        """Scattered points and grid bands agree with the serial evaluation"""
+        rng = np.random.default_rng(2)
+        surface = self._surface(rng)
+        uv = rng.random((500, 2))
+        us, vs = np.linspace(0, 1, 37), np.linspace(0, 1, 11)
+        assert np.allclose(parallel.evaluate_surface_points(surface, uv, workers=4, chunk_size=64),
+                           surface.evaluate_points(uv))
+        assert np.allclose(parallel.evaluate_surface_grid(surface, us, vs, workers=4, chunk_size=50),
+                           surface.evaluate_grid(us, vs))
+
+    def test_invalid_arguments(self):
+        curve = self._curve(np.random.default_rng(3))
+        with pytest.raises(ValueError):
+            parallel.evaluate_curve(curve, np.linspace(0, 1, 10), out=np.empty((10, 2)))
+        with pytest.raises(ValueError):
+            parallel.evaluate_curve(curve, np.linspace(0, 1, 10), chunk_size=0)
@@ -0,0 +1,55 @@
+import json
+import numpy as np
+import pytest
+from nurbs import profiling
+from nurbs.curve import NURBSCurve
+from interpolation.fitter import NURBSFitter
+
+
+def _curve():
+    knots = np.array([0, 0, 0, 0, 0.5, 1, 1, 1, 1], dtype=np.float64)
+    return NURBSCurve(np.random.default_rng(0).random((5, 3)), np.ones(5), knots, degree=3)
+
+
+def test_disabled_by_default():
+    """Outside profile() stages are a shared no-op"""
+    assert profiling.stage("a", 10) is profiling.stage("b")
+    _curve().evaluate_many(np.linspace(0, 1, 10))
+
+
+def test_stages_are_recorded(tmp_path):
+    """Calls, points and nested fitting stages show up in the report"""
+    curve = _curve()
+    points = np.cumsum(np.random.default_rng(1).random((50, 3)), axis=0)
+    with profiling.profile() as report:
+        curve.evaluate_many(np.linspace(0, 1, 100))
+        curve.evaluate_many(np.linspace(0, 1, 20))
+        NURBSFitter.interpolate(points)
+
+    evaluate = report.stages["curve.evaluate_many"]
+    assert evaluate.calls == 2 and evaluate.points == 120
+    for name in ("fitter.interpolate", "fitter.parameterize", "fitter.knots",
+                 "fitter.build_matrix", "fitter.solve"):
+        assert report.stages[name].calls == 1
+    assert report.stages["fitter.interpolate"].seconds >= report.stages["fitter.solve"].seconds
+    assert "fitter.solve" in report.table()
+
+    report.save(tmp_path / "profile.json")
+    saved = json.loads((tmp_path / "profile.json").read_text())
+    assert saved["stages"]["curve.evaluate_many"]["points"] == 120
+    assert profiling.stage("after") is profiling.stage("done")
+
+
+def test_memory_and_nesting():
+    """Allocations count towards the stage and its parents, profiles do not nest"""
+    with profiling.profile(memory=True) as report:
+        with profiling.stage("outer"):
+            with profiling.stage("inner"):
+                block = np.ones(1 << 20)
+            del block
+        with pytest.raises(RuntimeError):
+            with profiling.profile():
+                pass
+
+    assert report.stages["inner"].bytes >= 8 << 20
+    assert report.stages["outer"].bytes >= report.stages["inner"].bytes
@@ -0,0 +1,38 @@
+import numpy as np
+from nurbs.curve import NURBSCurve
+from nurbs.sampling import CurveSamples, SurfaceSamples
+from nurbs.surface import NURBSSurface
+
+
+class TestIncrementalSampling:
+    def test_curve_move(self):
+        """Only samples inside the support of the moved control point change"""
+        rng = np.random.default_rng(0)
+        knots = np.array([0, 0, 0, 0, 0.2, 0.4, 0.6, 0.8, 1, 1, 1, 1], dtype=np.float64)
+        curve = NURBSCurve(rng.random((8, 3)), rng.random(8) + 0.5, knots, degree=3)
+        ts = rng.permutation(np.linspace(0, 1, 201))
+        samples = CurveSamples(curve, ts)
+        before = samples.points.copy()
+
+        changed = samples.move([1], control_points=[[2.0, 2.0, 2.0]], weights=[3.0])
+        assert np.allclose(samples.points, curve.evaluate_many(ts))
+        # Control point 1 of a cubic only acts on (0, 0.4)
+        assert np.array_equal(changed, np.flatnonzero((ts > 0) & (ts < 0.4)))
+        unchanged = np.setdiff1d(np.arange(len(ts)), changed)
+        assert np.array_equal(samples.points[unchanged], before[unchanged])
+
+    def test_surface_move(self):
+        """Grid samples are updated in the support blocks of every edit"""
+        rng = np.random.default_rng(1)
+        knots = np.array([0, 0, 0, 0.25, 0.5, 0.75, 1, 1, 1], dtype=np.float64)
+        surface = NURBSSurface(rng.random((6, 6, 3)), rng.random((6, 6)) + 0.5, knots, knots, 2, 2)
+        us, vs = np.linspace(0, 1, 41), np.linspace(0, 1, 21)
+        samples = SurfaceSamples(surface, us, vs)
+
+        changed = samples.move([[0, 0], [5, 3]], control_points=rng.random((2, 3)),
+                               weights=[2.0, 0.5])
+        assert np.allclose(samples.points, surface.evaluate_grid(us, vs))
+        mask = np.zeros((len(us), len(vs)), dtype=bool)
+        mask[np.ix_(us < 0.25, vs < 0.25)] = True
+        mask[np.ix_(us > 0.75, (vs > 0.25) & (vs < 1))] = True
+        assert np.array_equal(changed, np.argwhere(mask))
@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Import time itself is tracked by the startup.import benchmark (make bench), not asserted here
+HEAVY = ["matplotlib", "mpl_toolkits", "numba", "visualization.plotter", "demonstrations.basic"]
+
+
+def _run(code: str) -> dict:
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                            text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_import_is_light():
+    """Importing the entry point loads neither plotting nor the JIT"""
+    report = _run(
+        "import json, sys\n"
+        "import main\n"
+        f"print(json.dumps({{'loaded': [m for m in {HEAVY!r} if m in sys.modules]}}))"
+    )
+    assert report["loaded"] == []
+
+
+def test_headless_batch(tmp_path):
+    """--batch generates, fits and exports without touching matplotlib"""
+    config = {
+        "synthetic": {"num_samples": 6, "points_per_curve": 20, "curve_types": ["helix", "random"],
+                      "noise_level": 0.1, "z_clip": [0, 3]},
+        "dataset": {"seed": 0, "shard_size": 4},
+    }
+    config_path, output = tmp_path / "config.yaml", tmp_path / "curves.nurbs"
+    config_path.write_text(yaml.safe_dump(config))
+    report = _run(
+        "import json, sys, main\n"
+        f"sys.argv = ['main', '--config', {str(config_path)!r}, '--batch', {str(output)!r}]\n"
+        "main.main()\n"
+        f"print(json.dumps({{'loaded': [m for m in {HEAVY!r} if m in sys.modules]}}))"
+    )
+    assert report["loaded"] == []
+    assert output.stat().st_size > 0
@@ -0,0 +1,62 @@
+import numpy as np
+from nurbs.curve import NURBSCurve
+from nurbs.surface import NURBSSurface
+from dataset.storage import NURBSDataset, NURBSDatasetWriter, write_dataset
+
+
+def random_curve(n: int, degree: int) -> NURBSCurve:
+    internal = np.sort(np.random.rand(n - degree - 1))
+    knots = np.concatenate([np.zeros(degree + 1), internal, np.ones(degree + 1)])
+    return NURBSCurve(np.random.rand(n, 3), np.random.rand(n) + 0.5, knots, degree)
+
+
+class TestNURBSDataset:
+    def test_curve_roundtrip(self, tmp_path):
+        """Variable-length curves come back as memory-mapped views"""
+        curves = [random_curve(n, d) for n, d in [(5, 2), (9, 3), (4, 1), (9, 3)]]
+        path = str(tmp_path / "curves.nurbs")
+        write_dataset(path, curves)
+        dataset = NURBSDataset(path)
+
+        assert len(dataset) == 4
+        for k, original in enumerate(curves):
+            loaded = dataset[k]
+            assert isinstance(loaded.control_points, np.memmap)
+            assert loaded.degree == original.degree
+            assert np.array_equal(loaded.control_points, original.control_points)
+            assert np.array_equal(loaded.weights, original.weights)
+            assert np.array_equal(loaded.knots, original.knots)
+
+    def test_curve_batch_view(self, tmp_path):
+        """Consecutive same-size curves load as one zero-copy batch"""
+        curves = [random_curve(6, 2) for _ in range(5)]
+        path = str(tmp_path / "batch.nurbs")
+        write_dataset(path, curves)
+        dataset = NURBSDataset(path)
+
+        batch = dataset.curve_batch(1, 4)
+        assert np.shares_memory(batch.control_points, dataset.points)
+        assert np.array_equal(batch.knots, np.stack([c.knots for c in curves[1:4]]))
+        assert np.allclose(batch.evaluate_many(np.linspace(0, 1, 5))[2],
+                           curves[3].evaluate_many(np.linspace(0, 1, 5)))
+
+    def test_surface_roundtrip(self, tmp_path):
+        """Surfaces keep their grid shape, knots and degrees"""
+        surface = NURBSSurface(
+            control_points=np.random.rand(4, 3, 3),
+            weights=np.random.rand(4, 3),
+            knots_u=np.array([0, 0, 0, 0.5, 1, 1, 1], dtype=np.float64),
+            knots_v=np.array([0, 0, 0.5, 1, 1], dtype=np.float64),
+            degree_u=2,
+            degree_v=1
+        )
+        path = str(tmp_path / "surfaces.nurbs")
+        with NURBSDatasetWriter(path, kind="surface") as writer:
+            writer.append(surface)
+            writer.append(surface)
+        loaded = NURBSDataset(path)[1]
+
+        assert loaded.control_points.shape == (4, 3, 3)
+        assert (loaded.degree_u, loaded.degree_v) == (2, 1)
+        assert np.array_equal(loaded.knots_v, surface.knots_v)
+        assert np.allclose(loaded.evaluate(0.3, 0.6), surface.evaluate(0.3, 0.6))
@@ -96,4 +96,126 @@ class TestNURBSSurface:
         # Evaluate at weighted point (u=1, v=1)
         point = surface.evaluate(1, 1)
         # Higher weight should "pull" the surface toward [1,1,0]
-        assert np.allclose(point, [1, 1, 0], atol=0.1)
\ No newline at end of file
+        assert np.allclose(point, [1, 1, 0], atol=0.1)
+
+    def _random_surface(self):
+        return NURBSSurface(
+            control_points=np.random.rand(6, 5, 3),
+            weights=np.random.rand(6, 5) + 0.5,
+            knots_u=np.array([0, 0, 0, 0, 0.3, 0.6, 1, 1, 1, 1]),
+            knots_v=np.array([0, 0, 0, 0.5, 0.5, 1, 1, 1]),
+            degree_u=3,
+            degree_v=2
+        )
+
+    def test_evaluate_grid_matches_scalar(self):
+        """Tensor-product grid evaluation agrees with evaluate"""
+        surface = self._random_surface()
+        u = np.linspace(0, 1, 7)
+        v = np.linspace(0, 1, 9)
+
+        expected = np.array([[surface.evaluate(ui, vi) for vi in v] for ui in u])
+        grid = surface.evaluate_grid(u, v)
+        assert grid.shape == (7, 9, 3)
+        assert np.allclose(grid, expected, atol=1e-12)
+
+    def test_evaluate_points_matches_scalar(self):
+        """Scattered batch evaluation agrees with evaluate"""
+        surface = self._random_surface()
+        uv = np.random.rand(25, 2)
+        uv[0] = [1.0, 1.0]
+
+        expected = np.array([surface.evaluate(u, v) for u, v in uv])
+        assert np.allclose(surface.evaluate_points(uv), expected, atol=1e-12)
+
+    def test_derivatives_match_finite_differences(self):
+        """Partial derivatives agree with central differences"""
+        surface = self._random_surface()
+        uv = np.array([[0.2, 0.3], [0.7, 0.8]])
+        h = 1e-5
+        du, dv = np.array([h, 0]), np.array([0, h])
+
+        S = surface.derivatives(uv, order=2)
+        assert np.allclose(S[0, 0], surface.evaluate_points(uv))
+        assert np.allclose(S[1, 0], (surface.evaluate_points(uv + du)
+                                     - surface.evaluate_points(uv - du)) / (2 * h), atol=1e-6)
+        assert np.allclose(S[0, 1], (surface.evaluate_points(uv + dv)
+                                     - surface.evaluate_points(uv - dv)) / (2 * h), atol=1e-6)
+        assert np.allclose(S[1, 1], (surface.derivatives(uv + dv)[1, 0]
+                                     - surface.derivatives(uv - dv)[1, 0]) / (2 * h), atol=1e-4)
+        assert np.allclose(S[2, 1], 0.0)
+
+    def test_plane_normals(self):
+        """Normals of a flat plane point along z"""
+        surface = NURBSSurface(
+            control_points=np.array([[[0, 0, 0], [1, 0, 0]],
+                                     [[0, 1, 0], [1, 1, 0]]], dtype=np.float64),
+            weights=np.ones((2, 2)),
+            knots_u=np.array([0, 0, 1, 1]),
+            knots_v=np.array([0, 0, 1, 1]),
+            degree_u=1,
+            degree_v=1
+        )
+        normals = surface.normals(np.random.rand(5, 2))
+        assert np.allclose(np.abs(normals), [0, 0, 1])
+
+    def test_closest_points(self):
+        """Projection matches a dense brute-force search"""
+        rng = np.random.default_rng(0)
+        surface = NURBSSurface(
+            control_points=rng.random((6, 5, 3)),
+            weights=rng.random((6, 5)) + 0.5,
+            knots_u=np.array([0, 0, 0, 0, 0.3, 0.6, 1, 1, 1, 1]),
+            knots_v=np.array([0, 0, 0, 0.4, 0.7, 1, 1, 1]),
+            degree_u=3,
+            degree_v=2
+        )
+        queries = rng.random((50, 3))
+
+        uv, closest, dist = surface.closest_points(queries)
+        side = np.linspace(0, 1, 301)
+        dense = surface.evaluate_grid(side, side).reshape(-1, 3)
+        brute = np.min(np.linalg.norm(queries[:, None] - dense[None], axis=2), axis=1)
+        assert np.all(dist <= brute + 1e-9)
+        assert np.allclose(closest, surface.evaluate_points(uv))
+
+    def test_knot_refinement_preserves_shape(self):
+        """Refinement in u and v changes the control net, not the surface"""
+        surface = self._random_surface()
+        uv = np.random.rand(100, 2)
+
+        refined = surface.refine(knots_u=[0.1, 0.6], knots_v=[0.25])
+        assert refined.control_points.shape == (8, 6, 3)
+        inserted = surface.insert_knot(0.7, direction="v")
+        assert inserted.control_points.shape == (6, 6, 3)
+        for other in (refined, inserted):
+            assert np.allclose(other.evaluate_points(uv), surface.evaluate_points(uv))
+
+    def test_bezier_evaluation(self):
+        """Cached Bezier patches match B-spline evaluation, per patch too"""
+        surface = self._random_surface()
+        uv = np.random.rand(100, 2)
+
+        breaks_u, breaks_v, patches = surface.bezier_patches()
+        assert patches.shape == (3, 2, 4, 3, 4)
+        assert np.allclose(surface.evaluate_bezier(uv), surface.evaluate_points(uv))
+
+        local = np.column_stack([np.linspace(0.3, 0.6, 7), np.linspace(0.5, 1, 7)])
+        assert np.allclose(surface.evaluate_bezier(local, patch=(1, 1)),
+                           surface.evaluate_points(local))
+
+    def test_float32_and_out(self):
+        """float32 nets evaluate in float32, grid and scattered points fill out buffers"""
+        rng = np.random.default_rng(0)
+        knots = np.array([0, 0, 0, 0.5, 1, 1, 1], dtype=np.float64)
+        surface = NURBSSurface(rng.random((4, 4, 3)).astype(np.float32),
+                               (rng.random((4, 4)) + 0.5).astype(np.float32), knots, knots, 2, 2)
+        us, uv = np.linspace(0, 1, 9), rng.random((20, 2))
+
+        grid = np.empty((9, 9, 3), dtype=np.float32)
+        assert surface.evaluate_grid(us, us, out=grid) is grid
+        points = np.empty((20, 3), dtype=np.float32)
+        assert surface.evaluate_points(uv, out=points) is points
+        assert surface.evaluate(0.3, 0.6).dtype == np.float32
+        assert np.allclose(points, [surface.evaluate(u, v) for u, v in uv], atol=1e-6)
+        assert np.allclose(grid[4, 2], surface.evaluate(0.5, 0.25), atol=1e-6)
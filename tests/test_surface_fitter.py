@@ -0,0 +1,75 @@
+import numpy as np
+from interpolation.fitter import NURBSFitter
+from nurbs.basis import basis_matrix
+from interpolation.surface_fitter import NURBSSurfaceFitter
+
+
+def _height_field(u, v):
+    return np.sin(3 * u) * np.cos(2 * v)
+
+
+class TestNURBSSurfaceFitter:
+    def _grid(self):
+        U, V = np.meshgrid(np.linspace(0, 1, 30), np.linspace(0, 1, 20), indexing='ij')
+        return np.stack([U, V, _height_field(U, V)], axis=-1)
+
+    def _grid_params(self, grid):
+        params_u = NURBSFitter.batch_chord_length_parameterization(grid.transpose(1, 0, 2))
+        params_v = NURBSFitter.batch_chord_length_parameterization(grid)
+        return params_u.mean(axis=0), params_v.mean(axis=0)
+
+    def test_grid_interpolation(self):
+        """Separable solves interpolate every grid point"""
+        grid = self._grid()
+        surface = NURBSSurfaceFitter.fit_grid(grid, degree_u=3, degree_v=2)
+
+        assert surface.control_points.shape == (30, 20, 3)
+        assert np.allclose(surface.evaluate_grid(*self._grid_params(grid)), grid, atol=1e-8)
+
+    def test_grid_approximation(self):
+        """Fewer control points still follow the grid, banded matches dense"""
+        grid = self._grid()
+        banded = NURBSSurfaceFitter.fit_grid(grid, num_control_points=(10, 8))
+        dense = NURBSSurfaceFitter.fit_grid(grid, num_control_points=(10, 8), solver="dense")
+
+        assert banded.control_points.shape == (10, 8, 3)
+        assert np.allclose(banded.control_points, dense.control_points)
+        assert np.abs(banded.evaluate_grid(*self._grid_params(grid)) - grid).max() < 1e-2
+
+    def test_scattered_points(self):
+        """Scattered samples of a height field are recovered, chunking does not matter"""
+        rng = np.random.default_rng(0)
+        uv = rng.random((20000, 2))
+        points = np.column_stack([uv, _height_field(uv[:, 0], uv[:, 1])])
+
+        surface = NURBSSurfaceFitter.fit_scattered(points, uv, num_control_points=(12, 12))
+        chunked = NURBSSurfaceFitter.fit_scattered(points, uv, num_control_points=(12, 12),
+                                                   chunk_size=1000)
+        assert np.allclose(surface.control_points, chunked.control_points)
+
+        queries = rng.random((500, 2))
+        expected = np.column_stack([queries, _height_field(queries[:, 0], queries[:, 1])])
+        assert np.abs(surface.evaluate_points(queries) - expected).max() < 1e-3
+
+    def test_scattered_matches_dense_least_squares(self):
+        """The banded normal equations give the dense least-squares net"""
+        rng = np.random.default_rng(2)
+        uv = rng.random((3000, 2))
+        points = np.column_stack([uv, _height_field(uv[:, 0], uv[:, 1])])
+        surface = NURBSSurfaceFitter.fit_scattered(points, uv, num_control_points=(9, 7),
+                                                   degree_u=2, degree_v=3, smoothing=0)
+
+        N = np.einsum('ki,kj->kij', basis_matrix(uv[:, 0], surface.knots_u, 2),
+                      basis_matrix(uv[:, 1], surface.knots_v, 3)).reshape(len(uv), -1)
+        expected = np.linalg.lstsq(N, points, rcond=None)[0].reshape(9, 7, 3)
+        assert np.allclose(surface.control_points, expected)
+
+    def test_plane_parameterization(self):
+        """Points of a tilted plane map onto the unit square"""
+        rng = np.random.default_rng(1)
+        uv = rng.random((100, 2))
+        points = np.column_stack([uv[:, 0], uv[:, 1], uv[:, 0] + uv[:, 1]])
+        params = NURBSSurfaceFitter.plane_parameterization(points)
+
+        assert params.min() == 0 and params.max() == 1
+        assert np.allclose(np.ptp(params, axis=0), 1)
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from nurbs.curve import NURBSCurve
+from nurbs.surface import NURBSSurface
+from nurbs.tessellation import tessellate_curve, tessellate_surface
+
+
+def _quarter_circle():
+    w = np.sqrt(2) / 2
+    return NURBSCurve(
+        control_points=np.array([[1, 0], [1, 1], [0, 1]], dtype=np.float64),
+        weights=np.array([1, w, 1]),
+        knots=np.array([0, 0, 0, 1, 1, 1], dtype=np.float64),
+        degree=2
+    )
+
+
+class TestTessellation:
+    def test_curve_tolerance(self):
+        curve = _quarter_circle()
+        coarse = tessellate_curve(curve, 1e-2)
+        fine = tessellate_curve(curve, 1e-4)
+        assert len(coarse.points) < len(fine.points)
+
+        # Chord midpoints of a unit circle sit 1 - cos(half angle) inside it
+        mids = (fine.points[1:] + fine.points[:-1]) / 2
+        assert np.all(1 - np.linalg.norm(mids, axis=1) <= 1e-4)
+        assert np.allclose(np.linalg.norm(fine.points, axis=1), 1)
+
+    def test_curve_leaves_basis_cache(self):
+        curve = _quarter_circle()
+        ts = np.linspace(0, 1, 50)
+        curve.evaluate_many(ts)
+        tessellate_curve(curve, 1e-4)
+        curve.evaluate_many(ts)
+        assert curve.cache_info()["size"] == 1 and curve.cache_info()["hits"] == 1
+
+    def test_curve_keeps_knots(self):
+        curve = NURBSCurve(
+            control_points=np.array([[0, 0], [1, 0], [2, 0], [3, 0]], dtype=np.float64),
+            weights=np.ones(4),
+            knots=np.array([0, 0, 0, 0.4, 1, 1, 1], dtype=np.float64),
+            degree=2
+        )
+        # A straight line needs no subdivision beyond its knots
+        polyline = tessellate_curve(curve, 1e-6)
+        assert np.allclose(polyline.params, [0, 0.4, 1])
+
+    def test_surface_tolerance(self, tmp_path):
+        rng = np.random.default_rng(0)
+        surface = NURBSSurface(
+            control_points=rng.random((5, 4, 3)),
+            weights=rng.random((5, 4)) + 0.5,
+            knots_u=np.array([0, 0, 0, 0, 0.5, 1, 1, 1, 1]),
+            knots_v=np.array([0, 0, 0, 0.5, 1, 1, 1]),
+            degree_u=3,
+            degree_v=2
+        )
+        mesh = tessellate_surface(surface, 1e-3)
+        assert np.allclose(mesh.vertices, surface.evaluate_points(mesh.params))
+
+        bary = rng.dirichlet(np.ones(3), size=len(mesh.faces))
+        uv = np.einsum('fk,fkd->fd', bary, mesh.params[mesh.faces])
+        flat = np.einsum('fk,fkd->fd', bary, mesh.vertices[mesh.faces])
+        assert np.linalg.norm(surface.evaluate_points(uv) - flat, axis=1).max() <= 1e-3
+
+        mesh.save_obj(tmp_path / "surface.obj")
+        lines = (tmp_path / "surface.obj").read_text().splitlines()
+        assert sum(line.startswith("f ") for line in lines) == len(mesh.faces)
+
+    def test_flat_surface(self):
+        surface = NURBSSurface(
+            control_points=np.array([[[0, 0, 0], [0, 1, 0]], [[1, 0, 0], [1, 1, 0]]], dtype=np.float64),
+            weights=np.ones((2, 2)),
+            knots_u=np.array([0, 0, 1, 1]),
+            knots_v=np.array([0, 0, 1, 1]),
+            degree_u=1,
+            degree_v=1
+        )
+        mesh = tessellate_surface(surface, 1e-6)
+        assert len(mesh.vertices) == 4 and len(mesh.faces) == 2
+        normal = np.cross(*(mesh.vertices[mesh.faces[0, 1:]] - mesh.vertices[mesh.faces[0, 0]]))
+        assert normal[2] > 0
+
+
+def test_output_buffer():
+    curve = _quarter_circle()
+    out = np.empty((1000, 2))
+    polyline = tessellate_curve(curve, 1e-4, out=out)
+    assert np.shares_memory(polyline.points, out)
+    assert np.allclose(out[:len(polyline.points)], curve.evaluate_many(polyline.params))
+    with pytest.raises(ValueError):
+        tessellate_curve(curve, 1e-4, out=np.empty((3, 2)))
@@ -3,16 +3,25 @@ from mpl_toolkits.mplot3d import Axes3D
 from typing import Optional, Tuple
 
 import numpy as np
+from nurbs import parallel
 from nurbs.curve import NURBSCurve
+from nurbs.surface import NURBSSurface
+from nurbs.tessellation import tessellate_curve, tessellate_surface
 
 
 class NURBSPresenter:
     @staticmethod
-    def render(nurbs: NURBSCurve, samples: int = 100,
-               ax: Optional[plt.Axes] = None) -> Tuple[plt.Figure, plt.Axes]:
+    def render(nurbs: NURBSCurve, samples: Optional[int] = None,
+               ax: Optional[plt.Axes] = None,
+               tolerance: float = 1e-3) -> Tuple[plt.Figure, plt.Axes]:
+        # Adaptive polyline within tolerance * control polygon size, unless samples is given
         is_3d = nurbs.control_points.shape[1] > 2
         fig, ax = NURBSPresenter.prepare_canvas(ax, is_3d)
-        curve = NURBSPresenter.sample_curve(nurbs, samples)
+        if samples is None:
+            scale = np.ptp(nurbs.control_points, axis=0).max()
+            curve = tessellate_curve(nurbs, tolerance * scale).points
+        else:
+            curve = NURBSPresenter.sample_curve(nurbs, samples)
 
         if is_3d:
             NURBSPresenter.plot3d(curve, nurbs.control_points, ax)
@@ -21,6 +30,16 @@ class NURBSPresenter:
 
         return fig, ax
 
+    @staticmethod
+    def render_surface(surface: NURBSSurface, ax: Optional[plt.Axes] = None,
+                       tolerance: float = 1e-3) -> Tuple[plt.Figure, plt.Axes]:
+        fig, ax = NURBSPresenter.prepare_canvas(ax, True)
+        scale = np.ptp(surface.control_points.reshape(-1, surface.control_points.shape[-1]), axis=0).max()
+        mesh = tessellate_surface(surface, tolerance * scale)
+        ax.plot_trisurf(mesh.vertices[:, 0], mesh.vertices[:, 1], mesh.vertices[:, 2],
+                        triangles=mesh.faces, alpha=0.8, cmap='viridis')
+        return fig, ax
+
     @staticmethod
     def prepare_canvas(ax: Optional[plt.Axes], is_3d: bool) -> Tuple[plt.Figure, plt.Axes]:
         if ax is None:
@@ -30,9 +49,13 @@ class NURBSPresenter:
         return ax.figure, ax
 
     @staticmethod
-    def sample_curve(nurbs: NURBSCurve, samples: int) -> np.ndarray:
+    def sample_curve(nurbs: NURBSCurve, samples: int, workers: Optional[int] = 1) -> np.ndarray:
+        # workers != 1 spreads the samples over a thread pool (None: one per core)
         domain = [nurbs.knots[nurbs.degree], nurbs.knots[-nurbs.degree-1]]
-        return np.array([nurbs.evaluate(t) for t in np.linspace(*domain, samples)])
+        ts = np.linspace(*domain, samples)
+        if workers == 1:
+            return nurbs.evaluate_many(ts)
+        return parallel.evaluate_curve(nurbs, ts, workers=workers)
 
     @staticmethod
     def plot2d(curve: np.ndarray, ctrl: np.ndarray, ax: plt.Axes) -> None: